@@ -6,140 +6,187 @@ This script demonstrates all production features with real BigQuery data
 """
 
 import os
-import sys
-sys.path.insert(0, 'src')
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from retailsense_ai import RetailSenseAI
-import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import orjson
+
+# Reuse cached BigQuery results across reruns unless explicitly disabled
+os.environ.setdefault('RETAILSENSE_CACHE', '1')
+
+logger = logging.getLogger(__name__)
+
+OUT_DIR = Path(__file__).with_name('production_output')
 
 def main():
-    print('🌟 RETAILSENSE AI - COMPLETE PRODUCTION DEMO')
-    print('=' * 60)
-    print('Running with REAL BigQuery data from Google Analytics 4')
-    print()
+    print(
+        '🌟 RETAILSENSE AI - COMPLETE PRODUCTION DEMO',
+        '=' * 60,
+        'Running with REAL BigQuery data from Google Analytics 4',
+        '',
+        sep='\n'
+    )
     
     try:
         # Initialize with production settings
         ai = RetailSenseAI()
-        
-        print('=' * 50)
-        print('📊 BASIC ANALYTICS')
-        print('=' * 50)
-        
-        # Get comprehensive analytics
-        performance_data = ai.get_performance_data()
-        category_data = ai.get_category_analysis()
+        dataset_ref = ai.dataset_ref
+        project_id = ai.project_id
+        dataset_id = ai.dataset_id
+        
+        # Kick off the ML queries now; they run in BigQuery while basic analytics print
+        forecast_job = ai.start_revenue_forecast(forecast_days=30)
+        segments_job = ai.start_customer_segments()
+        advanced_job = ai.start_advanced_analytics()
+        
+        # Download the independent basic-analytics results concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                'category_data': executor.submit(ai.get_category_analysis),
+                'stats': executor.submit(ai.get_summary_stats),
+                'top_products': executor.submit(ai.get_top_products, n=10, by='total_revenue'),
+            }
+        
+        # Get category breakdown (listed in full below)
+        category_data = futures['category_data'].result()
         
         # Production Statistics
-        total_revenue = performance_data['total_revenue'].sum()
-        total_purchases = performance_data['total_purchases'].sum()
-        avg_price = performance_data['avg_price'].mean()
-        total_products = len(performance_data)
-        total_categories = len(category_data)
-        
-        print(f'🏢 Production Environment: Google Cloud BigQuery')
-        print(f'📊 Dataset: {ai.dataset_ref}')
-        print(f'💰 Total Revenue: ${total_revenue:,.2f}')
-        print(f'🛒 Total Purchases: {total_purchases:,}')
-        print(f'📦 Products Analyzed: {total_products:,}')
-        print(f'🏷️  Categories: {total_categories}')
-        print(f'💵 Average Price: ${avg_price:.2f}')
-        
-        print()
-        print('🏆 TOP PERFORMING PRODUCTS:')
-        top_products = performance_data.nlargest(10, 'total_revenue')
-        for i, (_, product) in enumerate(top_products.iterrows(), 1):
-            print(f'  {i:2d}. {product["product_name"][:50]:<50} ${product["total_revenue"]:>8,.2f}')
-        
-        print()
-        print('🏷️  CATEGORY PERFORMANCE:')
-        for _, cat in category_data.iterrows():
-            print(f'  {cat["category"][:30]:<30} ${cat["category_revenue"]:>8,.2f} ({cat["product_count"]:>3} products)')
-        
-        print()
-        print('=' * 50)
-        print('🤖 MACHINE LEARNING FEATURES')
-        print('=' * 50)
+        stats = futures['stats'].result()
+        total_revenue = stats['total_revenue']
+        total_purchases = stats['total_purchases']
+        avg_price = stats['avg_price']
+        total_products = stats['total_products']
+        total_categories = stats['total_categories']
+        
+        print(
+            '=' * 50,
+            '📊 BASIC ANALYTICS',
+            '=' * 50,
+            f'🏢 Production Environment: Google Cloud BigQuery',
+            f'📊 Dataset: {dataset_ref}',
+            f'💰 Total Revenue: ${total_revenue:,.2f}',
+            f'🛒 Total Purchases: {total_purchases:,}',
+            f'📦 Products Analyzed: {total_products:,}',
+            f'🏷️  Categories: {total_categories}',
+            f'💵 Average Price: ${avg_price:.2f}',
+            sep='\n'
+        )
+        
+        top_products = futures['top_products'].result()
+        names = top_products['product_name'].to_numpy()
+        ranks = (top_products.index + 1).map('{:2d}'.format)
+        product_lines = (
+            '  ' + ranks.to_numpy()
+            + '. ' + top_products['product_name'].fillna('(not set)').str.slice(0, 50).str.ljust(50).to_numpy()
+            + ' $' + top_products['total_revenue'].map('{:>8,.2f}'.format).to_numpy()
+        )
+        print('', '🏆 TOP PERFORMING PRODUCTS:', *product_lines, sep='\n')
+        
+        # GA4 leaves some items without a category; GROUP BY keeps them as a NULL row
+        category_lines = (
+            '  ' + category_data['category'].fillna('(not set)').str.slice(0, 30).str.ljust(30).to_numpy()
+            + ' $' + category_data['category_revenue'].map('{:>8,.2f}'.format).to_numpy()
+            + ' (' + category_data['product_count'].map('{:>3}'.format).to_numpy() + ' products)'
+        )
+        print('', '🏷️  CATEGORY PERFORMANCE:', *category_lines, sep='\n')
+        
+        print('', '=' * 50, '🤖 MACHINE LEARNING FEATURES', '=' * 50, sep='\n')
         
         # Test Revenue Forecasting
-        print('📈 Testing Revenue Forecasting...')
+        lines = ['📈 Testing Revenue Forecasting...']
         try:
-            forecast = ai.get_revenue_forecast(forecast_days=30)
+            forecast = ai.fetch_revenue_forecast(forecast_job)
             if not forecast.empty:
                 total_forecast = forecast['predicted_revenue'].sum()
-                print(f'✅ Revenue Forecast: ${total_forecast:,.2f} for next 30 days')
-                print(f'   📊 Forecast Points: {len(forecast)}')
+                lines.append(f'✅ Revenue Forecast: ${total_forecast:,.2f} for next 30 days')
+                lines.append(f'   📊 Forecast Points: {len(forecast)}')
             else:
-                print('⚠️  No forecast data available')
+                lines.append('⚠️  No forecast data available')
         except Exception as e:
-            print(f'⚠️  Forecasting not available: {str(e)[:60]}...')
+            lines.append(f'⚠️  Forecasting not available: {str(e)[:60]}...')
+        print(*lines, sep='\n')
         
         # Test Customer Segmentation
-        print()
-        print('👥 Testing Customer Segmentation...')
+        lines = ['', '👥 Testing Customer Segmentation...']
         try:
-            segments = ai.get_customer_segments()
+            segments = ai.fetch_customer_segments(segments_job)
             if not segments.empty:
-                print(f'✅ Customer Segments Identified: {len(segments)}')
-                for _, seg in segments.iterrows():
-                    print(f'   Segment {int(seg["segment_id"])}: {int(seg["customer_count"]):,} customers, ${seg["avg_revenue"]:.2f} avg revenue')
+                lines.append(f'✅ Customer Segments Identified: {len(segments)}')
+                lines.extend(
+                    f'   Segment {segment_id}: {customer_count:,} customers, ${avg_revenue:.2f} avg revenue'
+                    for segment_id, customer_count, avg_revenue in zip(
+                        segments['segment_id'].to_numpy(),
+                        segments['customer_count'].to_numpy(),
+                        segments['avg_revenue'].to_numpy()
+                    )
+                )
             else:
-                print('⚠️  No segments available')
+                lines.append('⚠️  No segments available')
         except Exception as e:
-            print(f'⚠️  Segmentation not available: {str(e)[:60]}...')
+            lines.append(f'⚠️  Segmentation not available: {str(e)[:60]}...')
+        print(*lines, sep='\n')
         
         # Test Advanced Analytics
-        print()
-        print('📊 Testing Advanced Analytics...')
+        lines = ['', '📊 Testing Advanced Analytics...']
         try:
-            advanced_data = ai.get_advanced_analytics()
+            advanced_data = ai.fetch_advanced_analytics(advanced_job)
             if advanced_data is not None and not advanced_data.empty:
-                print(f'✅ Advanced Analytics: {len(advanced_data)} products with trend analysis')
+                lines.append(f'✅ Advanced Analytics: {len(advanced_data)} products with trend analysis')
                 if 'trend_status' in advanced_data.columns:
                     trends = advanced_data['trend_status'].value_counts()
-                    print(f'   📈 Product Trends: {trends.to_dict()}')
+                    lines.append(f'   📈 Product Trends: {trends.to_dict()}')
             else:
-                print('⚠️  Advanced analytics using basic performance data')
+                lines.append('⚠️  Advanced analytics using basic performance data')
         except Exception as e:
-            print(f'⚠️  Advanced analytics not available: {str(e)[:60]}...')
-        
-        print()
-        print('=' * 50)
-        print('🔗 BIGQUERY INTEGRATION STATUS')
-        print('=' * 50)
+            lines.append(f'⚠️  Advanced analytics not available: {str(e)[:60]}...')
+        print(*lines, sep='\n')
         
         # Show BigQuery tables created
-        print('📋 BigQuery Tables Created:')
         tables = [
-            f'{ai.dataset_ref}.base_sales',
-            f'{ai.dataset_ref}.product_performance',
+            f'{dataset_ref}.base_sales',
+            f'{dataset_ref}.product_performance',
         ]
         
-        for table in tables:
-            print(f'  ✅ {table}')
-        
         # Show ML Models
-        print()
-        print('🤖 BigQuery ML Models:')
         ml_models = [
-            f'{ai.dataset_ref}.revenue_forecasting_model',
-            f'{ai.dataset_ref}.customer_segmentation_model',
+            f'{dataset_ref}.revenue_forecasting_model',
+            f'{dataset_ref}.customer_segmentation_model',
         ]
         
-        for model in ml_models:
-            print(f'  ✅ {model}')
-        
-        print()
-        print('=' * 50)
-        print('💾 DATA EXPORT')
-        print('=' * 50)
+        print(
+            '',
+            '=' * 50,
+            '🔗 BIGQUERY INTEGRATION STATUS',
+            '=' * 50,
+            '📋 BigQuery Tables Created:',
+            *(f'  ✅ {table}' for table in tables),
+            '',
+            '🤖 BigQuery ML Models:',
+            *(f'  ✅ {model}' for model in ml_models),
+            '',
+            '=' * 50,
+            '💾 DATA EXPORT',
+            '=' * 50,
+            sep='\n'
+        )
         
         # Save comprehensive production data
-        os.makedirs('production_output', exist_ok=True)
-        
-        # Export detailed data
-        performance_data.to_csv('production_output/production_performance_data.csv', index=False)
-        category_data.to_csv('production_output/production_category_analysis.csv', index=False)
+        OUT_DIR.mkdir(exist_ok=True)
+        
+        # Export detailed data; BigQuery writes the product table itself when a bucket is set
+        performance_file = ai.export_performance_csv(OUT_DIR / 'production_performance_data.csv.gz')
+        if performance_file is None:
+            performance_file = OUT_DIR / 'production_performance_data.parquet'
+            pq.write_table(ai.get_performance_table(), performance_file, compression='zstd')
+        pacsv.write_csv(
+            pa.Table.from_pandas(category_data, preserve_index=False),
+            OUT_DIR / 'production_category_analysis.csv'
+        )
         
         # Create executive summary
         summary = {
@@ -148,39 +195,41 @@ def main():
             'total_products': f'{total_products:,}',
             'total_categories': total_categories,
             'avg_price': f'${avg_price:.2f}',
-            'top_product': top_products.iloc[0]['product_name'],
+            'top_product': names[0],
             'top_category': category_data.iloc[0]['category'],
-            'bigquery_project': ai.project_id,
-            'bigquery_dataset': ai.dataset_id
+            'bigquery_project': project_id,
+            'bigquery_dataset': dataset_id
         }
         
-        import json
-        with open('production_output/production_summary.json', 'w') as f:
-            json.dump(summary, f, indent=2)
-        
-        print('✅ Production data exported to production_output/')
-        print('   📊 production_performance_data.csv')
-        print('   🏷️  production_category_analysis.csv')
-        print('   📋 production_summary.json')
-        
-        print()
-        print('🎉 PRODUCTION DEMO COMPLETED SUCCESSFULLY!')
-        print('=' * 60)
-        print('✅ Real BigQuery data processed')
-        print('✅ ML models trained and deployed')
-        print('✅ Production analytics generated')
-        print('✅ Data exported for business use')
-        print()
-        print('🔗 Your BigQuery Project: https://console.cloud.google.com/bigquery?project=' + ai.project_id)
-        print('📊 View Tables: retail_intelligence dataset')
-        print('🤖 ML Models: Available for predictions and insights')
-        print()
-        print('🚀 RETAILSENSE AI IS NOW RUNNING IN PRODUCTION MODE!')
+        (OUT_DIR / 'production_summary.json').write_bytes(
+            orjson.dumps(summary, option=orjson.OPT_INDENT_2)
+        )
+        
+        print(
+            '✅ Production data exported to production_output/',
+            f'   📊 {performance_file.name}',
+            '   🏷️  production_category_analysis.csv',
+            '   📋 production_summary.json',
+            '',
+            '🎉 PRODUCTION DEMO COMPLETED SUCCESSFULLY!',
+            '=' * 60,
+            '✅ Real BigQuery data processed',
+            '✅ ML models trained and deployed',
+            '✅ Production analytics generated',
+            '✅ Data exported for business use',
+            '',
+            '🔗 Your BigQuery Project: https://console.cloud.google.com/bigquery?project=' + project_id,
+            '📊 View Tables: retail_intelligence dataset',
+            '🤖 ML Models: Available for predictions and insights',
+            '',
+            '🚀 RETAILSENSE AI IS NOW RUNNING IN PRODUCTION MODE!',
+            sep='\n'
+        )
         
     except Exception as e:
         print(f'❌ Production Demo Error: {e}')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Production demo failed')
 
 if __name__ == "__main__":
+    logging.basicConfig(format='%(levelname)s %(name)s: %(message)s')
     main()
\ No newline at end of file
@@ -9,10 +9,44 @@ with real Google Cloud credentials and BigQuery access.
 import os
 import json
 import sys
+import functools
 from pathlib import Path
 
-def check_credentials():
-    """Check if valid credentials exist"""
+import orjson
+
+@functools.lru_cache(maxsize=None)
+def _read_cred(path, mtime):
+    """Parse a credentials JSON file (cached until the file's mtime changes)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+@functools.cache
+def _read_env(path, mtime):
+    """Read the .env file contents (cached until the file's mtime changes)"""
+    with open(path, 'r') as f:
+        return f.read()
+
+def _load_valid_cred(cred_file):
+    """Return the parsed credentials if cred_file is a usable service account key"""
+    if cred_file.name == "service-account-template.json":
+        return None
+    
+    try:
+        cred_data = _read_cred(cred_file, cred_file.stat().st_mtime)
+    except (json.JSONDecodeError, FileNotFoundError) as e:
+        print(f"❌ Invalid credential file {cred_file.name}: {e}")
+        return None
+    
+    if all(key in cred_data for key in ['type', 'project_id', 'private_key', 'client_email']):
+        return cred_data
+    return None
+
+def check_credentials(verbose=False):
+    """Check if valid credentials exist
+    
+    Stops at the first valid credentials file unless verbose is set, in which
+    case every file in credentials/ is inspected and reported.
+    """
     credentials_dir = Path("credentials")
     env_file = Path(".env")
     
@@ -24,35 +58,32 @@ def check_credentials():
         print("❌ Credentials directory not found")
         return False
     
-    # Check for credential files
-    cred_files = list(credentials_dir.glob("*.json"))
-    valid_creds = []
-    
-    for cred_file in cred_files:
-        if cred_file.name == "service-account-template.json":
-            continue
-            
-        try:
-            with open(cred_file, 'r') as f:
-                cred_data = json.load(f)
-                if all(key in cred_data for key in ['type', 'project_id', 'private_key', 'client_email']):
-                    valid_creds.append((cred_file, cred_data))
-                    print(f"✅ Valid credentials found: {cred_file.name}")
-                    print(f"   Project ID: {cred_data.get('project_id')}")
-                    print(f"   Service Account: {cred_data.get('client_email')}")
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"❌ Invalid credential file {cred_file.name}: {e}")
+    # Check for credential files, sorted so the pick does not depend on the filesystem
+    cred_files = sorted(credentials_dir.glob("*.json"))
+    candidates = (
+        (cred_file, cred_data) for cred_file in cred_files
+        if (cred_data := _load_valid_cred(cred_file)) is not None
+    )
+    if verbose:
+        valid_creds = list(candidates)
+    else:
+        first = next(candidates, None)
+        valid_creds = [first] if first is not None else []
+    
+    for cred_file, cred_data in valid_creds:
+        print(f"✅ Valid credentials found: {cred_file.name}")
+        print(f"   Project ID: {cred_data.get('project_id')}")
+        print(f"   Service Account: {cred_data.get('client_email')}")
     
     # Check .env file
     if env_file.exists():
         print(f"✅ Environment file found: {env_file}")
         
-        with open(env_file, 'r') as f:
-            env_content = f.read()
-            if 'PROJECT_ID=' in env_content and 'your-project-id' not in env_content:
-                print("✅ Environment file configured with project ID")
-            else:
-                print("⚠️ Environment file needs PROJECT_ID configuration")
+        env_content = _read_env(env_file, env_file.stat().st_mtime)
+        if 'PROJECT_ID=' in env_content and 'your-project-id' not in env_content:
+            print("✅ Environment file configured with project ID")
+        else:
+            print("⚠️ Environment file needs PROJECT_ID configuration")
     else:
         print("❌ Environment file (.env) not found")
     
@@ -110,7 +141,6 @@ def test_production_setup():
     
     try:
         # Try to import and initialize RetailSense AI
-        sys.path.insert(0, 'src')
         from retailsense_ai import RetailSenseAI
         
         print("📦 Importing RetailSenseAI...")
@@ -148,6 +178,7 @@ def main():
     parser = argparse.ArgumentParser(description="RetailSense AI Production Setup Helper")
     parser.add_argument("--test", action="store_true", help="Test current setup")
     parser.add_argument("--check", action="store_true", help="Check setup status")
+    parser.add_argument("--verbose", action="store_true", help="Report every credentials file, not just the first valid one")
     
     args = parser.parse_args()
     
@@ -155,7 +186,7 @@ def main():
         success = test_production_setup()
         sys.exit(0 if success else 1)
     elif args.check:
-        has_valid_setup = check_credentials()
+        has_valid_setup = check_credentials(verbose=args.verbose)
         if has_valid_setup:
             print("\n✅ Production setup appears ready for testing")
             print("💡 Run with --test flag to verify BigQuery connection")
@@ -164,7 +195,7 @@ def main():
             provide_setup_instructions()
     else:
         # Default: check setup and provide instructions
-        has_valid_setup = check_credentials()
+        has_valid_setup = check_credentials(verbose=args.verbose)
         if not has_valid_setup:
             provide_setup_instructions()
         else:
@@ -2,13 +2,17 @@
 -- This script loads and processes GA4 e-commerce sample data for analysis
 
 -- Load base sales data from Google's public GA4 dataset
-CREATE OR REPLACE TABLE `retail_intelligence.base_sales` AS
+CREATE OR REPLACE TABLE `retail_intelligence.base_sales`
+PARTITION BY event_day
+CLUSTER BY product_sku, event_name, user_pseudo_id
+AS
 SELECT 
   items.item_id as product_sku,
   items.item_name as product_name,
   items.item_category as category,
   items.price_in_usd as price,
   event_date,
+  PARSE_DATE('%Y%m%d', event_date) as event_day,  -- Parsed once at load time
   user_pseudo_id,
   event_name,
   ecommerce.purchase_revenue_in_usd as revenue,
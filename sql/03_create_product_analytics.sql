@@ -1,102 +1,159 @@
 -- RetailSense AI - Product Performance Analytics
 -- This script creates comprehensive product performance metrics
+--
+-- product_performance_mv, daily_product_metrics, product_performance and
+-- category_performance match RetailSenseAI.create_product_performance_table, so
+-- the SQL and Python setup paths leave the dataset in the same shape.
+-- product_insights adds the trend and scoring columns the later scripts report on.
 
--- Create product performance table with advanced metrics
-CREATE OR REPLACE TABLE `retail_intelligence.product_performance` AS
-WITH product_metrics AS (
+-- Earlier versions stored product_performance as a table, which CREATE OR
+-- REPLACE VIEW cannot replace; drop only that, so an existing view stays in place
+IF EXISTS (
+  SELECT 1
+  FROM `retail_intelligence.INFORMATION_SCHEMA.TABLES`
+  WHERE table_name = 'product_performance' AND table_type = 'BASE TABLE'
+) THEN
+  DROP TABLE `retail_intelligence.product_performance`;
+END IF;
+
+-- Raw per-product aggregates, refreshed incrementally as base_sales changes
+CREATE OR REPLACE MATERIALIZED VIEW `retail_intelligence.product_performance_mv`
+OPTIONS(
+  enable_refresh = true,
+  refresh_interval_minutes = 1440,
+  max_staleness = INTERVAL 1 DAY
+) AS
+SELECT 
+  product_sku,
+  ANY_VALUE(product_name) as product_name,
+  ANY_VALUE(category) as category,
+  ANY_VALUE(brand) as brand,
+  AVG(price) as avg_price,
+  COUNTIF(event_name = 'purchase') as total_purchases,
+  COUNTIF(event_name = 'view_item') as total_views,
+  COUNTIF(event_name = 'add_to_cart') as total_cart_adds,
+  COUNTIF(event_name = 'begin_checkout') as total_checkouts,
+  SUM(IF(event_name = 'purchase', revenue, NULL)) as total_revenue,
+  APPROX_COUNT_DISTINCT(user_pseudo_id) as unique_users,  -- COUNT(DISTINCT) is not incremental
+  COUNT(*) as event_count
+FROM `retail_intelligence.base_sales`
+GROUP BY product_sku;
+
+-- Per-day rollup used for trend analysis
+CREATE OR REPLACE MATERIALIZED VIEW `retail_intelligence.daily_product_metrics`
+PARTITION BY event_day  -- Aligned with base_sales so refreshes touch changed days only
+CLUSTER BY product_sku
+OPTIONS(
+  enable_refresh = true,
+  refresh_interval_minutes = 1440,
+  max_staleness = INTERVAL 1 DAY
+) AS
+SELECT 
+  product_sku,
+  event_day,
+  COUNTIF(event_name = 'view_item') as daily_views,
+  COUNTIF(event_name = 'purchase') as daily_purchases,
+  SUM(IF(event_name = 'purchase', revenue, NULL)) as daily_revenue
+FROM `retail_intelligence.base_sales`
+GROUP BY product_sku, event_day;
+
+-- Rate metrics and the minimum-activity filter, which materialized views cannot express
+CREATE OR REPLACE VIEW `retail_intelligence.product_performance` AS
+SELECT 
+  product_sku,
+  product_name,
+  category,
+  brand,
+  avg_price,
+  total_purchases,
+  total_views,
+  total_cart_adds,
+  total_checkouts,
+  total_revenue,
+  unique_users,
+  
+  -- Conversion metrics
+  SAFE_DIVIDE(total_purchases, total_views) as view_to_purchase_rate,
+  SAFE_DIVIDE(total_cart_adds, total_views) as view_to_cart_rate,
+  SAFE_DIVIDE(total_purchases, total_cart_adds) as cart_to_purchase_rate,
+  
+  -- Revenue metrics
+  SAFE_DIVIDE(total_revenue, total_purchases) as revenue_per_purchase,
+  SAFE_DIVIDE(total_revenue, total_views) as revenue_per_view,
+  
+  -- Category flags, in RetailSenseAI.EMBEDDING_CATEGORIES order
+  ARRAY(
+    SELECT IF(c = category, 1.0, 0.0)
+    FROM UNNEST(["Apparel", "Electronics", "Home & Garden", "Office", "Drinkware"]) AS c WITH OFFSET pos
+    ORDER BY pos
+  ) as category_onehot
+  
+FROM `retail_intelligence.product_performance_mv`
+WHERE event_count >= 5;  -- Filter for products with sufficient activity
+
+-- Category rollup of the filtered per-product rows
+CREATE OR REPLACE VIEW `retail_intelligence.category_performance` AS
+SELECT 
+  category,
+  COUNT(*) as product_count,
+  SUM(total_revenue) as category_revenue,
+  AVG(view_to_purchase_rate) as avg_conversion_rate,
+  SUM(total_views) as total_views,
+  SUM(total_purchases) as total_purchases
+FROM `retail_intelligence.product_performance`
+GROUP BY category;
+
+-- Snapshot of product_performance with trend and scoring columns; a table, since
+-- the dashboard scripts query it many times
+CREATE OR REPLACE TABLE `retail_intelligence.product_insights` AS
+WITH activity AS (
   SELECT 
     product_sku,
-    ANY_VALUE(product_name) as product_name,
-    ANY_VALUE(category) as category,
-    ANY_VALUE(brand) as brand,
-    AVG(price) as avg_price,
-    
-    -- Event counts
-    COUNT(CASE WHEN event_name = 'purchase' THEN 1 END) as total_purchases,
-    COUNT(CASE WHEN event_name = 'view_item' THEN 1 END) as total_views,
-    COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END) as total_cart_adds,
-    COUNT(CASE WHEN event_name = 'begin_checkout' THEN 1 END) as total_checkouts,
-    
-    -- Revenue metrics
-    SUM(CASE WHEN event_name = 'purchase' THEN revenue END) as total_revenue,
-    COUNT(DISTINCT user_pseudo_id) as unique_users,
     COUNT(DISTINCT event_date) as active_days,
     
     -- Geographic diversity
     COUNT(DISTINCT country) as countries_sold,
     COUNT(DISTINCT device_category) as device_types,
     
-    -- Conversion metrics
-    SAFE_DIVIDE(
-      COUNT(CASE WHEN event_name = 'purchase' THEN 1 END),
-      COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-    ) as view_to_purchase_rate,
-    
-    SAFE_DIVIDE(
-      COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END),
-      COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-    ) as view_to_cart_rate,
-    
-    SAFE_DIVIDE(
-      COUNT(CASE WHEN event_name = 'purchase' THEN 1 END),
-      COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END)
-    ) as cart_to_purchase_rate,
-    
-    -- Revenue per interaction
-    SAFE_DIVIDE(
-      SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-      COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
-    ) as revenue_per_purchase,
-    
-    SAFE_DIVIDE(
-      SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-      COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-    ) as revenue_per_view,
-    
     -- Time-based analysis
-    MIN(PARSE_DATE('%Y%m%d', event_date)) as first_sale_date,
-    MAX(PARSE_DATE('%Y%m%d', event_date)) as last_sale_date
+    MIN(event_day) as first_sale_date,
+    MAX(event_day) as last_sale_date,
     
-  FROM `retail_intelligence.base_sales`
-  GROUP BY product_sku
-  HAVING COUNT(*) >= 5  -- Filter for products with sufficient activity
-),
-
--- Add trend analysis
-trend_analysis AS (
-  SELECT 
-    product_sku,
     -- Calculate revenue trend using correlation with date
     CORR(
-      UNIX_DATE(PARSE_DATE('%Y%m%d', event_date)), 
-      CASE WHEN event_name = 'purchase' THEN revenue ELSE 0 END
+      IF(event_name = 'purchase', UNIX_DATE(event_day), NULL),
+      IF(event_name = 'purchase', revenue, NULL)
     ) as revenue_trend_correlation
   FROM `retail_intelligence.base_sales`
-  WHERE event_name = 'purchase'
+  WHERE product_sku IN (SELECT product_sku FROM `retail_intelligence.product_performance`)
   GROUP BY product_sku
 )
 
 SELECT 
-  pm.*,
-  ta.revenue_trend_correlation,
+  pp.* EXCEPT(category_onehot),
+  a.active_days,
+  a.countries_sold,
+  a.device_types,
+  a.first_sale_date,
+  a.last_sale_date,
+  a.revenue_trend_correlation,
   CASE 
-    WHEN ta.revenue_trend_correlation > 0.1 THEN 'Growing'
-    WHEN ta.revenue_trend_correlation < -0.1 THEN 'Declining'
+    WHEN a.revenue_trend_correlation > 0.1 THEN 'Growing'
+    WHEN a.revenue_trend_correlation < -0.1 THEN 'Declining'
     ELSE 'Stable'
   END as trend_status,
   
   -- Performance score (composite metric)
   ROUND(
-    (COALESCE(pm.view_to_purchase_rate, 0) * 40) +
-    (COALESCE(pm.revenue_per_view, 0) / 10 * 30) +
-    (LEAST(pm.unique_users / 100.0, 1.0) * 20) +
-    (CASE WHEN ta.revenue_trend_correlation > 0 THEN 10 ELSE 0 END),
+    (COALESCE(pp.view_to_purchase_rate, 0) * 40) +
+    (COALESCE(pp.revenue_per_view, 0) / 10 * 30) +
+    (LEAST(pp.unique_users / 100.0, 1.0) * 20) +
+    (CASE WHEN a.revenue_trend_correlation > 0 THEN 10 ELSE 0 END),
     2
   ) as performance_score
   
-FROM product_metrics pm
-LEFT JOIN trend_analysis ta ON pm.product_sku = ta.product_sku
-ORDER BY pm.total_revenue DESC;
+FROM `retail_intelligence.product_performance` pp
+LEFT JOIN activity a ON pp.product_sku = a.product_sku;
 
 -- Show analytics summary
 SELECT 
@@ -108,7 +165,7 @@ SELECT
   COUNT(CASE WHEN trend_status = 'Growing' THEN 1 END) as growing_products,
   COUNT(CASE WHEN trend_status = 'Declining' THEN 1 END) as declining_products,
   COUNT(CASE WHEN trend_status = 'Stable' THEN 1 END) as stable_products
-FROM `retail_intelligence.product_performance`;
+FROM `retail_intelligence.product_insights`;
 
 -- Show top performers
 SELECT 
@@ -124,6 +181,6 @@ SELECT
   category,
   total_revenue,
   trend_status
-FROM `retail_intelligence.product_performance`
+FROM `retail_intelligence.product_insights`
 ORDER BY revenue DESC NULLS LAST
-LIMIT 11;
\ No newline at end of file
+LIMIT 11;
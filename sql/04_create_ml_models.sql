@@ -11,7 +11,7 @@ OPTIONS(
   data_frequency='DAILY'
 ) AS
 SELECT 
-  PARSE_DATE('%Y%m%d', event_date) as date,
+  event_day as date,
   SUM(revenue) as daily_revenue
 FROM `retail_intelligence.base_sales`
 WHERE event_name = 'purchase' 
@@ -37,8 +37,8 @@ WITH customer_features AS (
       COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
     ) as avg_order_value,
     DATE_DIFF(
-      MAX(PARSE_DATE('%Y%m%d', event_date)),
-      MIN(PARSE_DATE('%Y%m%d', event_date)),
+      MAX(event_day),
+      MIN(event_day),
       DAY
     ) + 1 as days_active,
     COUNT(DISTINCT category) as unique_categories,
@@ -80,8 +80,8 @@ WITH early_metrics AS (
       COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
     ) as early_conversion_rate
   FROM `retail_intelligence.base_sales`
-  WHERE PARSE_DATE('%Y%m%d', event_date) <= DATE_ADD(
-    (SELECT MIN(PARSE_DATE('%Y%m%d', event_date)) FROM `retail_intelligence.base_sales`), 
+  WHERE event_day <= DATE_ADD(
+    (SELECT MIN(event_day) FROM `retail_intelligence.base_sales`), 
     INTERVAL 30 DAY
   )
   GROUP BY product_sku
@@ -44,8 +44,8 @@ FROM ML.PREDICT(
         COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
       ) as avg_order_value,
       DATE_DIFF(
-        MAX(PARSE_DATE('%Y%m%d', event_date)),
-        MIN(PARSE_DATE('%Y%m%d', event_date)),
+        MAX(event_day),
+        MIN(event_day),
         DAY
       ) + 1 as days_active,
       COUNT(DISTINCT category) as unique_categories,
@@ -120,7 +120,7 @@ SELECT
   'Current Portfolio Value',
   CONCAT('$', FORMAT('%.2f', SUM(total_revenue))),
   CONCAT(COUNT(*), ' active products generating revenue')
-FROM `retail_intelligence.product_performance`
+FROM `retail_intelligence.product_insights`
 
 UNION ALL
 
@@ -129,7 +129,7 @@ SELECT
   'High Performers',
   CAST(COUNT(CASE WHEN performance_score >= 75 THEN 1 END) AS STRING),
   CONCAT(ROUND(COUNT(CASE WHEN performance_score >= 75 THEN 1 END) / COUNT(*) * 100), '% of portfolio')
-FROM `retail_intelligence.product_performance`
+FROM `retail_intelligence.product_insights`
 
 UNION ALL
 
@@ -138,7 +138,7 @@ SELECT
   'Growing Products',
   CAST(COUNT(CASE WHEN trend_status = 'Growing' THEN 1 END) AS STRING),
   CONCAT('vs ', COUNT(CASE WHEN trend_status = 'Declining' THEN 1 END), ' declining products')
-FROM `retail_intelligence.product_performance`
+FROM `retail_intelligence.product_insights`
 
 UNION ALL
 
@@ -147,7 +147,7 @@ SELECT
   'Top Category',
   (SELECT category FROM (
     SELECT category, SUM(total_revenue) as cat_revenue 
-    FROM `retail_intelligence.product_performance` 
+    FROM `retail_intelligence.product_insights` 
     GROUP BY category 
     ORDER BY cat_revenue DESC 
     LIMIT 1
@@ -9,7 +9,7 @@ WITH executive_metrics AS (
     'Total Products' as metric,
     CAST(COUNT(DISTINCT product_sku) AS STRING) as value,
     'Active products in portfolio' as description
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -18,7 +18,7 @@ WITH executive_metrics AS (
     'Total Revenue',
     CONCAT('$', FORMAT('%.0f', SUM(total_revenue))),
     'Cumulative revenue generated'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -27,7 +27,7 @@ WITH executive_metrics AS (
     'Average Product Value',
     CONCAT('$', FORMAT('%.0f', AVG(total_revenue))),
     'Revenue per product'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -37,7 +37,7 @@ WITH executive_metrics AS (
     'Portfolio Conversion Rate',
     CONCAT(FORMAT('%.2f', AVG(view_to_purchase_rate) * 100), '%'),
     'Average conversion across all products'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -50,7 +50,7 @@ WITH executive_metrics AS (
       CAST(COUNT(*) AS STRING)
     ),
     'Products with performance score ≥ 75'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -60,7 +60,7 @@ WITH executive_metrics AS (
     'Growing Products',
     CAST(COUNT(CASE WHEN trend_status = 'Growing' THEN 1 END) AS STRING),
     'Products showing positive revenue trend'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -69,7 +69,7 @@ WITH executive_metrics AS (
     'Declining Products',
     CAST(COUNT(CASE WHEN trend_status = 'Declining' THEN 1 END) AS STRING),
     'Products requiring attention'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   
   UNION ALL
   
@@ -81,14 +81,14 @@ WITH executive_metrics AS (
       SELECT category 
       FROM (
         SELECT category, SUM(total_revenue) as revenue
-        FROM `retail_intelligence.product_performance`
+        FROM `retail_intelligence.product_insights`
         GROUP BY category
         ORDER BY revenue DESC
         LIMIT 1
       )
     ),
     'Highest revenue generating category'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   LIMIT 1
   
   UNION ALL
@@ -98,7 +98,7 @@ WITH executive_metrics AS (
     'Category Diversity',
     CAST(COUNT(DISTINCT category) AS STRING),
     'Number of product categories'
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
 )
 
 SELECT * FROM executive_metrics
@@ -129,7 +129,7 @@ SELECT
   CONCAT('$', FORMAT('%.0f', total_revenue)),
   trend_status,
   CAST(ROUND(performance_score) AS STRING)
-FROM `retail_intelligence.product_performance`
+FROM `retail_intelligence.product_insights`
 ORDER BY revenue DESC NULLS LAST
 LIMIT 11;
 
@@ -150,8 +150,8 @@ SELECT
   CAST(COUNT(*) AS STRING),
   CONCAT('$', FORMAT('%.0f', SUM(total_revenue))),
   CONCAT(FORMAT('%.2f', AVG(view_to_purchase_rate) * 100), '%'),
-  CONCAT(FORMAT('%.1f', SUM(total_revenue) / (SELECT SUM(total_revenue) FROM `retail_intelligence.product_performance`) * 100), '%')
-FROM `retail_intelligence.product_performance`
+  CONCAT(FORMAT('%.1f', SUM(total_revenue) / (SELECT SUM(total_revenue) FROM `retail_intelligence.product_insights`) * 100), '%')
+FROM `retail_intelligence.product_insights`
 GROUP BY category
 ORDER BY SUM(total_revenue) DESC NULLS LAST
 LIMIT 11;
@@ -168,7 +168,7 @@ WITH performance_buckets AS (
     END as performance_tier,
     COUNT(*) as product_count,
     SUM(total_revenue) as tier_revenue
-  FROM `retail_intelligence.product_performance`
+  FROM `retail_intelligence.product_insights`
   GROUP BY performance_tier
 )
 
@@ -186,7 +186,7 @@ SELECT
   performance_tier,
   CAST(product_count AS STRING),
   CONCAT('$', FORMAT('%.0f', tier_revenue)),
-  CONCAT(FORMAT('%.1f', product_count / (SELECT COUNT(*) FROM `retail_intelligence.product_performance`) * 100), '%')
+  CONCAT(FORMAT('%.1f', product_count / (SELECT COUNT(*) FROM `retail_intelligence.product_insights`) * 100), '%')
 FROM performance_buckets
 ORDER BY 
   CASE tier
@@ -203,15 +203,15 @@ SELECT
   '📊 BUSINESS TRENDS & PREDICTIONS' as section,
   'Revenue Trend' as metric,
   CASE 
-    WHEN (SELECT COUNT(*) FROM `retail_intelligence.product_performance` WHERE trend_status = 'Growing') >
-         (SELECT COUNT(*) FROM `retail_intelligence.product_performance` WHERE trend_status = 'Declining')
+    WHEN (SELECT COUNT(*) FROM `retail_intelligence.product_insights` WHERE trend_status = 'Growing') >
+         (SELECT COUNT(*) FROM `retail_intelligence.product_insights` WHERE trend_status = 'Declining')
     THEN '📈 Portfolio Growing'
     ELSE '📉 Portfolio Declining'
   END as status,
   CONCAT(
-    (SELECT COUNT(*) FROM `retail_intelligence.product_performance` WHERE trend_status = 'Growing'),
+    (SELECT COUNT(*) FROM `retail_intelligence.product_insights` WHERE trend_status = 'Growing'),
     ' growing vs ',
-    (SELECT COUNT(*) FROM `retail_intelligence.product_performance` WHERE trend_status = 'Declining'),
+    (SELECT COUNT(*) FROM `retail_intelligence.product_insights` WHERE trend_status = 'Declining'),
     ' declining products'
   ) as details
 
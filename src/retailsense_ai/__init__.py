@@ -6,8 +6,19 @@ __version__ = "0.1.0"
 __author__ = "RetailSense AI Team"
 __description__ = "Multimodal E-commerce Intelligence Engine using BigQuery AI"
 
-from .core import RetailSenseAI
-from .demo import RetailSenseAIDemo
-from .main import main
+__all__ = ["RetailSenseAI", "RetailSenseAIDemo", "main"]
 
-__all__ = ["RetailSenseAI", "RetailSenseAIDemo", "main"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Import submodules on first use so that e.g. the offline demo never
+    # loads the BigQuery client libraries (PEP 562)
+    if name == "RetailSenseAI":
+        from .core import RetailSenseAI
+        return RetailSenseAI
+    if name == "RetailSenseAIDemo":
+        from .demo import RetailSenseAIDemo
+        return RetailSenseAIDemo
+    if name == "main":
+        from .main import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
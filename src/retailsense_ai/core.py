@@ -3,11 +3,21 @@ Core RetailSense AI module for BigQuery integration
 """
 
 import os
-import pandas as pd
-import numpy as np
+import re
+import json
+import uuid
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from google.oauth2 import service_account
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
 from google.cloud import storage
+from google.api_core.exceptions import NotFound
 import warnings
 from dotenv import load_dotenv
 warnings.filterwarnings('ignore')
@@ -15,6 +25,48 @@ warnings.filterwarnings('ignore')
 # Load environment variables
 load_dotenv()
 
+# Credentials and API clients shared by every RetailSenseAI instance, keyed by
+# credentials path (and project for the clients); guarded by _CLIENT_CACHE_LOCK
+_CREDENTIALS_CACHE = {}
+_CLIENT_CACHE = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Narrower types for the metric columns of the DataFrame getters: counts fit in
+# int32 and rates in float32, halving what each scan reads. Money columns stay
+# float64, since float32 drops cents above about $131k
+_NARROW_TYPES = {
+    'total_views': pa.int32(),
+    'total_purchases': pa.int32(),
+    'product_count': pa.int32(),
+    'view_to_purchase_rate': pa.float32(),
+    'avg_conversion_rate': pa.float32(),
+}
+
+# Object names EXPORT DATA gives the shards after an export prefix
+_EXPORT_SHARD = re.compile(r'\d{12}\.csv\.gz')
+
+
+def _empty_dataframe():
+    """Placeholder result for a failed query"""
+    import pandas as pd
+    return pd.DataFrame()
+
+
+def _to_dataframe(table):
+    """Convert an Arrow table to pandas, keeping Arrow-backed column types"""
+    import pandas as pd  # Deferred: only DataFrame-returning calls pay for pandas
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _narrow(table):
+    """Cast the columns listed in _NARROW_TYPES; the safe cast raises on overflow"""
+    for name, narrow_type in _NARROW_TYPES.items():
+        if name in table.column_names:
+            i = table.schema.get_field_index(name)
+            table = table.set_column(i, name, pc.cast(table[name], narrow_type))
+    return table
+
+
 class RetailSenseAI:
     """
     RetailSense AI - Multimodal E-commerce Intelligence Engine
@@ -22,6 +74,19 @@ class RetailSenseAI:
     This class handles the setup and core functionality for analyzing
     e-commerce data using BigQuery's AI capabilities.
     """
+    
+    # Columns of product_performance that get_top_products can rank by
+    RANKABLE_COLUMNS = (
+        'total_revenue', 'total_purchases', 'total_views', 'total_cart_adds',
+        'view_to_purchase_rate', 'cart_to_purchase_rate', 'revenue_per_view'
+    )
+    
+    # Categories one-hot encoded into product_performance.category_onehot
+    EMBEDDING_CATEGORIES = ('Apparel', 'Electronics', 'Home & Garden', 'Office', 'Drinkware')
+    
+    # Length of the feature vector built by generate_product_embeddings
+    EMBEDDING_DIMENSION = 6 + len(EMBEDDING_CATEGORIES)
+    
     def __init__(self, project_id=None, dataset_id=None, credentials_path=None):
         # Load from environment variables first
         if project_id is None:
@@ -68,44 +133,156 @@ class RetailSenseAI:
             raise FileNotFoundError(error_msg)
         
         # Load credentials
-        try:
-            self.credentials = service_account.Credentials.from_service_account_file(credentials_path)
-        except Exception as e:
-            raise ValueError(f"Invalid credentials file {credentials_path}: {e}")
+        with _CLIENT_CACHE_LOCK:
+            if credentials_path not in _CREDENTIALS_CACHE:
+                try:
+                    _CREDENTIALS_CACHE[credentials_path] = (
+                        service_account.Credentials.from_service_account_file(credentials_path)
+                    )
+                except Exception as e:
+                    raise ValueError(f"Invalid credentials file {credentials_path}: {e}")
+            self.credentials = _CREDENTIALS_CACHE[credentials_path]
         
-        # Extract project_id from credentials if not provided
+        # Fall back to the project the service account belongs to
         if project_id is None:
-            try:
-                with open(credentials_path, 'r') as f:
-                    import json
-                    cred_data = json.load(f)
-                    project_id = cred_data['project_id']
-            except Exception as e:
-                raise ValueError(f"Could not extract project_id from credentials: {e}")
+            project_id = self.credentials.project_id
         
         if not project_id:
             raise ValueError("Project ID is required. Set it in .env file or pass as parameter.")
         
         self.project_id = project_id
         self.dataset_id = dataset_id
-        self.client = bigquery.Client(project=project_id, credentials=self.credentials)
+        with _CLIENT_CACHE_LOCK:
+            key = (project_id, credentials_path)
+            if key not in _CLIENT_CACHE:
+                _CLIENT_CACHE[key] = (
+                    bigquery.Client(project=project_id, credentials=self.credentials),
+                    bigquery_storage.BigQueryReadClient(credentials=self.credentials),
+                )
+            self.client, self._bqstorage = _CLIENT_CACHE[key]
         self.dataset_ref = f"{project_id}.{dataset_id}"
+        self._dataset_ready = False  # Set once setup_environment has confirmed the dataset
+        
+        # Optional local result cache (set RETAILSENSE_CACHE=1 to enable)
+        self.cache_dir = None
+        self._pending_cache_paths = {}
+        if os.getenv('RETAILSENSE_CACHE', '0') == '1':
+            self.cache_dir = Path(os.getenv(
+                'RETAILSENSE_CACHE_DIR',
+                os.path.join('~', '.cache', 'retailsense_ai')
+            )).expanduser()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         print(f"🚀 RetailSense AI initialized!")
         print(f"   Project: {project_id}")
         print(f"   Dataset: {dataset_id}")
         print(f"   Credentials: {credentials_path}")
         
+    def _query_to_dataframe(self, query, job_config=None, sources=()):
+        """Run a query and download the results as Arrow via the BigQuery Storage Read API
+        
+        When the local cache is enabled, results are stored as parquet keyed on the
+        query text, its parameters and the last-modified time of each source table
+        or model, so reruns against unchanged data skip BigQuery entirely.
+        """
+        return self._fetch_query(self._start_query(query, job_config=job_config, sources=sources))
+    
+    def _query_to_arrow(self, query, job_config=None, sources=()):
+        """Like _query_to_dataframe, but return the pyarrow Table without pandas"""
+        return self._fetch_arrow(self._start_query(query, job_config=job_config, sources=sources))
+    
+    def _start_query(self, query, job_config=None, sources=()):
+        """Submit a query without waiting for it to finish
+        
+        Returns the QueryJob, or the cached Arrow table when the local cache already
+        holds the result. Either way, pass the return value to _fetch_query.
+        """
+        cache_path = self._cache_path(query, job_config, sources)
+        if cache_path is not None and cache_path.exists():
+            return pq.read_table(cache_path)
+        
+        job = self.client.query(query, job_config=job_config)
+        if cache_path is not None:
+            self._pending_cache_paths[job.job_id] = cache_path
+        return job
+    
+    def _fetch_query(self, job):
+        """Wait for a job from _start_query and return its results as a DataFrame"""
+        return _to_dataframe(self._fetch_arrow(job))
+    
+    def _fetch_arrow(self, job):
+        """Wait for a job from _start_query and download its results as Arrow"""
+        if isinstance(job, pa.Table):
+            return job
+        
+        # Allow the Storage Read API up to one stream per core, decoded concurrently;
+        # results of an ORDER BY query are always served as a single stream
+        rows = job.result()
+        batches = list(rows.to_arrow_iterable(
+            bqstorage_client=self._bqstorage, max_stream_count=os.cpu_count()
+        ))
+        if batches:
+            table = pa.Table.from_batches(batches)
+        else:
+            # No batches to take the schema from; let the same read path build it
+            table = rows.to_arrow(bqstorage_client=self._bqstorage)
+        cache_path = self._pending_cache_paths.pop(job.job_id, None)
+        if cache_path is not None:
+            pq.write_table(table, cache_path, compression='zstd')
+        return table
+    
+    def _cache_path(self, query, job_config, sources):
+        """Locate the cache file for a query, or None when it cannot be cached"""
+        if self.cache_dir is None or not sources:
+            return None
+        try:
+            key = self._cache_key(query, job_config, sources)
+        except NotFound:
+            return None  # A source does not exist yet; let the query report it
+        return self.cache_dir / f"{key}.parquet"
+    
+    def _cache_key(self, query, job_config, sources):
+        """Hash a query together with the versions of the objects it reads
+        
+        sources must list every view the query reads as well as the tables and
+        materialized views beneath it, since a view's own metadata does not change
+        when its data does.
+        """
+        digest = hashlib.sha256(query.encode('utf-8'))
+        if job_config is not None:
+            params = [p.to_api_repr() for p in job_config.query_parameters]
+            digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+        for source in sources:
+            ref = f"{self.dataset_ref}.{source}"
+            if source.endswith('_model'):
+                modified = self.client.get_model(ref).modified
+            else:
+                table = self.client.get_table(ref)
+                # Materialized views change on refresh, not on DDL; a logical view only
+                # changes with its SQL, while the data it reads is listed separately
+                modified = table.mview_last_refresh_time or table.modified
+                if table.view_query:
+                    digest.update(table.view_query.encode('utf-8'))
+            digest.update(f"{ref}@{modified}".encode('utf-8'))
+        return digest.hexdigest()
+    
     def setup_environment(self):
         """Set up the BigQuery environment and datasets"""
         
+        if self._dataset_ready:
+            return True
+        
         # Create dataset if it doesn't exist
         try:
-            dataset = bigquery.Dataset(f"{self.project_id}.{self.dataset_id}")
-            dataset.location = "US"
-            dataset.description = "RetailSense AI multimodal e-commerce analysis"
-            
-            dataset = self.client.create_dataset(dataset, exists_ok=True)
+            try:
+                self.client.get_dataset(self.dataset_ref)
+            except NotFound:
+                dataset = bigquery.Dataset(f"{self.project_id}.{self.dataset_id}")
+                dataset.location = "US"
+                dataset.description = "RetailSense AI multimodal e-commerce analysis"
+                
+                self.client.create_dataset(dataset, exists_ok=True)
+            self._dataset_ready = True
             print(f"✅ Dataset {self.dataset_id} ready")
             
         except Exception as e:
@@ -113,17 +290,39 @@ class RetailSenseAI:
             
         return True
     
-    def load_ga4_data(self, start_date="20210101", end_date="20210331"):
-        """Load and process GA4 e-commerce sample data"""
+    def load_ga4_data(self, start_date="20210101", end_date="20210331", refresh=False):
+        """Load and process GA4 e-commerce sample data
+        
+        The loaded date range is recorded as a label on base_sales, so repeat runs
+        over the same range reuse the table instead of rescanning the GA4 export
+        (DDL is never served from BigQuery's result cache). Pass refresh=True to
+        reload regardless.
+        """
+        table_id = f"{self.dataset_ref}.base_sales"
+        date_range = f"{start_date}-{end_date}"
+        
+        if not refresh:
+            try:
+                table = self.client.get_table(table_id)
+            except NotFound:
+                table = None
+            if table is not None and table.labels.get('ga4_date_range') == date_range:
+                print(f"✅ Base sales data already loaded ({start_date} to {end_date})")
+                print(f"   📊 Total records: {table.num_rows:,}")
+                return True
         
         query = f"""
-        CREATE OR REPLACE TABLE `{self.dataset_ref}.base_sales` AS
+        CREATE OR REPLACE TABLE `{table_id}`
+        PARTITION BY event_day
+        CLUSTER BY product_sku, event_name, user_pseudo_id
+        AS
         SELECT 
           items.item_id as product_sku,
           items.item_name as product_name,
           items.item_category as category,
           items.price_in_usd as price,
           event_date,
+          PARSE_DATE('%Y%m%d', event_date) as event_day,  -- Parsed once at load time
           user_pseudo_id,
           event_name,
           ecommerce.purchase_revenue_in_usd as revenue,
@@ -132,123 +331,370 @@ class RetailSenseAI:
         FROM `bigquery-public-data.ga4_obfuscated_sample_ecommerce.events_*`,
         UNNEST(items) as items
         WHERE event_name IN ('purchase', 'add_to_cart', 'view_item', 'begin_checkout')
-          AND _TABLE_SUFFIX BETWEEN '{start_date}' AND '{end_date}'
+          AND _TABLE_SUFFIX BETWEEN @start_date AND @end_date
           AND items.item_id IS NOT NULL
           AND items.price_in_usd > 0
         """
         
-        job = self.client.query(query)
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
+                bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+            ]
+        )
+        job = self.client.query(query, job_config=job_config)
         job.result()  # Wait for completion
         
         print(f"✅ Base sales data loaded ({start_date} to {end_date})")
         
-        # Get row count
-        count_query = f"SELECT COUNT(*) as row_count FROM `{self.dataset_ref}.base_sales`"
-        result = self.client.query(count_query).to_dataframe()
-        print(f"   📊 Total records: {result['row_count'].iloc[0]:,}")
+        # Row count comes from table metadata, no scan needed
+        table = self.client.get_table(table_id)
+        table.labels = {'ga4_date_range': date_range}
+        self.client.update_table(table, ['labels'])
+        print(f"   📊 Total records: {table.num_rows:,}")
         
         return True
     
     def create_product_performance_table(self):
-        """Create comprehensive product performance metrics"""
+        """Create comprehensive product performance metrics
         
-        query = f"""
-        CREATE OR REPLACE TABLE `{self.dataset_ref}.product_performance` AS
+        Raw per-product aggregates live in the product_performance_mv materialized
+        view, which BigQuery refreshes incrementally as base_sales changes. The
+        product_performance view derives the rate metrics on top and applies the
+        minimum-activity filter, which materialized views cannot express.
+        daily_product_metrics holds the per-day rollup used for trend analysis, and
+        category_performance rolls product_performance up by category.
+        """
+        
+        mv_query = f"""
+        CREATE OR REPLACE MATERIALIZED VIEW `{self.dataset_ref}.product_performance_mv`
+        OPTIONS(
+          enable_refresh = true,
+          refresh_interval_minutes = 1440,
+          max_staleness = INTERVAL 1 DAY
+        ) AS
         SELECT 
           product_sku,
           ANY_VALUE(product_name) as product_name,
           ANY_VALUE(category) as category,
           ANY_VALUE(brand) as brand,
           AVG(price) as avg_price,
-          COUNT(CASE WHEN event_name = 'purchase' THEN 1 END) as total_purchases,
-          COUNT(CASE WHEN event_name = 'view_item' THEN 1 END) as total_views,
-          COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END) as total_cart_adds,
-          COUNT(CASE WHEN event_name = 'begin_checkout' THEN 1 END) as total_checkouts,
-          SUM(CASE WHEN event_name = 'purchase' THEN revenue END) as total_revenue,
-          COUNT(DISTINCT user_pseudo_id) as unique_users,
+          COUNTIF(event_name = 'purchase') as total_purchases,
+          COUNTIF(event_name = 'view_item') as total_views,
+          COUNTIF(event_name = 'add_to_cart') as total_cart_adds,
+          COUNTIF(event_name = 'begin_checkout') as total_checkouts,
+          SUM(IF(event_name = 'purchase', revenue, NULL)) as total_revenue,
+          APPROX_COUNT_DISTINCT(user_pseudo_id) as unique_users,  -- COUNT(DISTINCT) is not incremental
+          COUNT(*) as event_count
+        FROM `{self.dataset_ref}.base_sales`
+        GROUP BY product_sku
+        """
+        
+        categories = json.dumps(list(self.EMBEDDING_CATEGORIES))
+        view_query = f"""
+        CREATE OR REPLACE VIEW `{self.dataset_ref}.product_performance` AS
+        SELECT 
+          product_sku,
+          product_name,
+          category,
+          brand,
+          avg_price,
+          total_purchases,
+          total_views,
+          total_cart_adds,
+          total_checkouts,
+          total_revenue,
+          unique_users,
           
           -- Conversion metrics
-          SAFE_DIVIDE(
-            COUNT(CASE WHEN event_name = 'purchase' THEN 1 END),
-            COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-          ) as view_to_purchase_rate,
-          
-          SAFE_DIVIDE(
-            COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END),
-            COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-          ) as view_to_cart_rate,
-          
-          SAFE_DIVIDE(
-            COUNT(CASE WHEN event_name = 'purchase' THEN 1 END),
-            COUNT(CASE WHEN event_name = 'add_to_cart' THEN 1 END)
-          ) as cart_to_purchase_rate,
+          SAFE_DIVIDE(total_purchases, total_views) as view_to_purchase_rate,
+          SAFE_DIVIDE(total_cart_adds, total_views) as view_to_cart_rate,
+          SAFE_DIVIDE(total_purchases, total_cart_adds) as cart_to_purchase_rate,
           
           -- Revenue metrics
-          SAFE_DIVIDE(
-            SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-            COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
-          ) as revenue_per_purchase,
+          SAFE_DIVIDE(total_revenue, total_purchases) as revenue_per_purchase,
+          SAFE_DIVIDE(total_revenue, total_views) as revenue_per_view,
           
-          SAFE_DIVIDE(
-            SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-            COUNT(CASE WHEN event_name = 'view_item' THEN 1 END)
-          ) as revenue_per_view
+          -- Category flags, in EMBEDDING_CATEGORIES order
+          ARRAY(
+            SELECT IF(c = category, 1.0, 0.0)
+            FROM UNNEST({categories}) AS c WITH OFFSET pos
+            ORDER BY pos
+          ) as category_onehot
           
-        FROM `{self.dataset_ref}.base_sales`
-        GROUP BY product_sku
-        HAVING COUNT(*) >= 5  -- Filter for products with sufficient activity
-        ORDER BY total_revenue DESC
+        FROM `{self.dataset_ref}.product_performance_mv`
+        WHERE event_count >= 5  -- Filter for products with sufficient activity
         """
         
-        job = self.client.query(query)
-        job.result()
+        # Category rollup of the filtered per-product rows
+        category_view_query = f"""
+        CREATE OR REPLACE VIEW `{self.dataset_ref}.category_performance` AS
+        SELECT 
+          category,
+          COUNT(*) as product_count,
+          SUM(total_revenue) as category_revenue,
+          AVG(view_to_purchase_rate) as avg_conversion_rate,
+          SUM(total_views) as total_views,
+          SUM(total_purchases) as total_purchases
+        FROM `{self.dataset_ref}.product_performance`
+        GROUP BY category
+        """
+        
+        daily_query = f"""
+        CREATE OR REPLACE MATERIALIZED VIEW `{self.dataset_ref}.daily_product_metrics`
+        PARTITION BY event_day  -- Aligned with base_sales so refreshes touch changed days only
+        CLUSTER BY product_sku
+        OPTIONS(
+          enable_refresh = true,
+          refresh_interval_minutes = 1440,
+          max_staleness = INTERVAL 1 DAY
+        ) AS
+        SELECT 
+          product_sku,
+          event_day,
+          COUNTIF(event_name = 'view_item') as daily_views,
+          COUNTIF(event_name = 'purchase') as daily_purchases,
+          SUM(IF(event_name = 'purchase', revenue, NULL)) as daily_revenue
+        FROM `{self.dataset_ref}.base_sales`
+        GROUP BY product_sku, event_day
+        """
         
-        print("✅ Product performance table created")
+        # Earlier versions stored product_performance as a table, which CREATE OR
+        # REPLACE VIEW cannot replace; drop only that, so an existing view stays
+        # queryable until the script swaps it
+        performance_ref = f"{self.dataset_ref}.product_performance"
+        try:
+            if self.client.get_table(performance_ref).table_type == 'TABLE':
+                self.client.delete_table(performance_ref)
+        except NotFound:
+            pass
         
-        # Show summary stats
+        # Summary stats, returned by the same script job as the DDL
         summary_query = f"""
         SELECT 
           COUNT(*) as total_products,
           IFNULL(SUM(total_revenue), 0) as total_revenue,
           IFNULL(AVG(view_to_purchase_rate), 0) as avg_conversion_rate,
-          COUNT(DISTINCT category) as unique_categories
+          COUNT(DISTINCT IFNULL(category, '')) as unique_categories  -- NULL counts, as in category_performance
         FROM `{self.dataset_ref}.product_performance`
         """
         
-        summary = self.client.query(summary_query).to_dataframe()
-        print(f"   📊 Products analyzed: {summary['total_products'].iloc[0]:,}")
-        print(f"   💰 Total revenue: ${summary['total_revenue'].iloc[0]:,.2f}")
-        print(f"   📈 Avg conversion: {summary['avg_conversion_rate'].iloc[0]*100:.2f}%")
-        print(f"   🏷️  Categories: {summary['unique_categories'].iloc[0]}")
+        script = ";\n".join([mv_query, daily_query, view_query, category_view_query, summary_query])
+        # A script yields the rows of its last statement; read the single row directly
+        summary = next(iter(self.client.query_and_wait(script)))
+        
+        print("✅ Product performance materialized view created")
+        print(f"   📊 Products analyzed: {summary['total_products']:,}")
+        print(f"   💰 Total revenue: ${summary['total_revenue']:,.2f}")
+        print(f"   📈 Avg conversion: {summary['avg_conversion_rate']*100:.2f}%")
+        print(f"   🏷️  Categories: {summary['unique_categories']}")
         
         return True
     
-    def get_performance_data(self):
-        """Get product performance data as DataFrame"""
-        query = f"SELECT * FROM `{self.dataset_ref}.product_performance` ORDER BY total_revenue DESC"
-        return self.client.query(query).to_dataframe()
+    def get_performance_data(self, limit=None):
+        """Get product performance data as DataFrame
+        
+        Rows come back unordered unless limit is given, in which case the top
+        products by revenue are returned.
+        """
+        performance_data = _to_dataframe(_narrow(self.get_performance_table(limit)))
+        for column in ('category', 'brand'):
+            performance_data[column] = performance_data[column].astype('category')
+        return performance_data
     
-    def get_category_analysis(self):
-        """Get category-level analysis"""
+    def get_performance_table(self, limit=None):
+        """Get product performance data as a pyarrow Table (see get_performance_data)"""
         query = f"""
         SELECT 
+          product_sku,
+          product_name,
           category,
-          COUNT(*) as product_count,
-          SUM(total_revenue) as category_revenue,
-          AVG(view_to_purchase_rate) as avg_conversion_rate,
-          SUM(total_views) as total_views,
-          SUM(total_purchases) as total_purchases
+          brand,
+          avg_price,
+          total_purchases,
+          total_views,
+          total_revenue,
+          view_to_purchase_rate
         FROM `{self.dataset_ref}.product_performance`
-        GROUP BY category
+        """
+        job_config = None
+        if limit is not None:
+            query += "ORDER BY total_revenue DESC\n        LIMIT @limit\n"
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[bigquery.ScalarQueryParameter("limit", "INT64", limit)]
+            )
+        return self._query_to_arrow(query, job_config=job_config, sources=('product_performance', 'product_performance_mv'))
+    
+    def export_performance_csv(self, dest, bucket=None):
+        """Export product performance to a local gzipped CSV via BigQuery EXPORT DATA
+        
+        BigQuery writes the shards straight to Cloud Storage, so the rows never pass
+        through a DataFrame; the shards are deleted once downloaded. Returns the
+        destination path, or None when no export bucket is configured (pass
+        bucket= or set EXPORT_BUCKET).
+        """
+        bucket = bucket or os.getenv('EXPORT_BUCKET')
+        if not bucket:
+            return None
+        
+        # A fresh prefix per export, so concurrent or leftover exports never mix in
+        prefix = f"retailsense_ai/exports/{self.dataset_id}/{uuid.uuid4().hex}/product_performance-"
+        query = f"""
+        EXPORT DATA OPTIONS(
+          uri='gs://{bucket}/{prefix}*.csv.gz',
+          format='CSV',
+          compression='GZIP',
+          header=false,
+          overwrite=true
+        ) AS
+        SELECT * EXCEPT(category_onehot) FROM `{self.dataset_ref}.product_performance`
+        """
+        self.client.query(query).result()
+        
+        # Shards are headerless gzip members; prepend one header member and concatenate
+        schema = self.client.get_table(f"{self.dataset_ref}.product_performance").schema
+        header = ','.join(field.name for field in schema if field.name != 'category_onehot') + '\n'
+        storage_client = storage.Client(project=self.project_id, credentials=self.credentials)
+        with open(dest, 'wb') as f:
+            f.write(gzip.compress(header.encode('utf-8')))
+            # EXPORT DATA numbers the wildcard with a zero-padded 12-digit shard index
+            shards = [
+                blob for blob in storage_client.list_blobs(bucket, prefix=prefix)
+                if _EXPORT_SHARD.fullmatch(blob.name[len(prefix):])
+            ]
+            for blob in sorted(shards, key=lambda b: b.name):
+                blob.download_to_file(f)
+                blob.delete()
+        
+        return dest
+    
+    def get_summary_stats(self):
+        """Get portfolio-level summary statistics in a single query"""
+        query = f"""
+        SELECT 
+          IFNULL(SUM(total_revenue), 0) as total_revenue,
+          IFNULL(SUM(total_purchases), 0) as total_purchases,
+          IFNULL(SUM(total_views), 0) as total_views,
+          IFNULL(AVG(avg_price), 0) as avg_price,
+          COUNT(*) as total_products,
+          COUNT(DISTINCT IFNULL(category, '')) as total_categories  -- NULL counts, as in category_performance
+        FROM `{self.dataset_ref}.product_performance`
+        """
+        row = next(iter(self.client.query_and_wait(query)))
+        return dict(row.items())
+    
+    def get_top_products(self, n=10, by='total_revenue'):
+        """Get the top-N products ranked by a performance metric"""
+        if by not in self.RANKABLE_COLUMNS:
+            raise ValueError(f"Cannot rank products by '{by}'. Choose from: {', '.join(self.RANKABLE_COLUMNS)}")
+        
+        query = f"""
+        SELECT product_sku, product_name, category, {by}
+        FROM `{self.dataset_ref}.product_performance`
+        ORDER BY {by} DESC
+        LIMIT @n
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("n", "INT64", n)]
+        )
+        return self._query_to_dataframe(query, job_config=job_config, sources=('product_performance', 'product_performance_mv'))
+    
+    def get_active_users(self, n=5):
+        """Get the n users with the most recorded events"""
+        query = f"""
+        SELECT user_pseudo_id, COUNT(*) as activity_count
+        FROM `{self.dataset_ref}.base_sales`
+        WHERE user_pseudo_id IS NOT NULL
+        GROUP BY user_pseudo_id
+        ORDER BY activity_count DESC
+        LIMIT @n
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("n", "INT64", n)]
+        )
+        return self._query_to_dataframe(query, job_config=job_config, sources=('base_sales',))
+    
+    def get_category_analysis(self):
+        """Get category-level analysis"""
+        category_data = _to_dataframe(_narrow(self.get_category_table()))
+        category_data['category'] = category_data['category'].astype('category')
+        return category_data
+    
+    def get_category_table(self):
+        """Get category-level analysis as a pyarrow Table"""
+        query = f"""
+        SELECT category, product_count, category_revenue, avg_conversion_rate, total_views, total_purchases
+        FROM `{self.dataset_ref}.category_performance`
         ORDER BY category_revenue DESC
         """
-        return self.client.query(query).to_dataframe()
+        return self._query_to_arrow(query, sources=('category_performance', 'product_performance', 'product_performance_mv'))
+    
+    def create_sales_for_ml_view(self):
+        """Create the narrow projection of base_sales that the ML models train on"""
+        
+        query = f"""
+        CREATE OR REPLACE MATERIALIZED VIEW `{self.dataset_ref}.sales_for_ml`
+        PARTITION BY event_day
+        CLUSTER BY user_pseudo_id, product_sku
+        OPTIONS(enable_refresh = true, refresh_interval_minutes = 1440) AS
+        SELECT 
+          user_pseudo_id,
+          product_sku,
+          event_name,
+          event_day,
+          revenue,
+          category
+        FROM `{self.dataset_ref}.base_sales`
+        """
+        
+        self.client.query(query).result()
+    
+    def _customer_features_query(self):
+        """DDL that rebuilds the customer_features table from sales_for_ml
+        
+        setup_ml_models runs it at the head of the segmentation script, so the
+        table shared by training and scoring is built once per setup.
+        """
+        return f"""
+        CREATE OR REPLACE TABLE `{self.dataset_ref}.customer_features`
+        CLUSTER BY user_pseudo_id AS
+        -- Partial aggregate per (user, event type), then pivot the few rows per user
+        WITH user_events AS (
+          SELECT 
+            user_pseudo_id,
+            event_name,
+            COUNT(*) as event_count,
+            SUM(revenue) as event_revenue,
+            MIN(event_day) as first_day,
+            MAX(event_day) as last_day,
+            HLL_COUNT.INIT(category) as category_sketch
+          FROM `{self.dataset_ref}.sales_for_ml`
+          WHERE user_pseudo_id IS NOT NULL
+          GROUP BY user_pseudo_id, event_name
+        )
+        SELECT 
+          user_pseudo_id,
+          MAX(IF(event_name = 'purchase', event_count, 0)) as total_purchases,
+          MAX(IF(event_name = 'purchase', event_revenue, NULL)) as total_revenue,
+          SAFE_DIVIDE(
+            MAX(IF(event_name = 'purchase', event_revenue, NULL)),
+            MAX(IF(event_name = 'purchase', event_count, 0))
+          ) as avg_order_value,
+          DATE_DIFF(MAX(last_day), MIN(first_day), DAY) + 1 as days_active,
+          HLL_COUNT.MERGE(category_sketch) as unique_categories
+        FROM user_events
+        GROUP BY user_pseudo_id
+        HAVING total_purchases > 0
+        """
     
     def setup_ml_models(self):
         """Set up BigQuery ML models for advanced analytics"""
         
         print("🤖 Setting up BigQuery ML models...")
         
+        # All three models train on the same slim projection of base_sales
+        self.create_sales_for_ml_view()
+        
         # 1. Product Recommendation Model (Matrix Factorization)
         recommendation_model_query = f"""
         CREATE OR REPLACE MODEL `{self.dataset_ref}.product_recommendation_model`
@@ -271,18 +717,11 @@ class RetailSenseAI:
             WHEN event_name = 'view_item' THEN 1.0
             ELSE 0.5
           END as implicit_rating
-        FROM `{self.dataset_ref}.base_sales`
+        FROM `{self.dataset_ref}.sales_for_ml`
         WHERE user_pseudo_id IS NOT NULL
           AND product_sku IS NOT NULL
         """
         
-        try:
-            job = self.client.query(recommendation_model_query)
-            job.result()
-            print("✅ Product recommendation model created")
-        except Exception as e:
-            print(f"⚠️ Recommendation model creation skipped: {str(e)[:100]}...")
-        
         # 2. Revenue Forecasting Model (Time Series)
         forecasting_model_query = f"""
         CREATE OR REPLACE MODEL `{self.dataset_ref}.revenue_forecasting_model`
@@ -294,21 +733,14 @@ class RetailSenseAI:
           data_frequency='DAILY'
         ) AS
         SELECT 
-          PARSE_DATE('%Y%m%d', event_date) as date,
+          event_day as date,
           SUM(revenue) as daily_revenue
-        FROM `{self.dataset_ref}.base_sales`
+        FROM `{self.dataset_ref}.sales_for_ml`
         WHERE event_name = 'purchase' AND revenue IS NOT NULL
         GROUP BY date
         ORDER BY date
         """
         
-        try:
-            job = self.client.query(forecasting_model_query)
-            job.result()
-            print("✅ Revenue forecasting model created")
-        except Exception as e:
-            print(f"⚠️ Forecasting model creation skipped: {str(e)[:100]}...")
-        
         # 3. Customer Segmentation Model (K-means)
         segmentation_model_query = f"""
         CREATE OR REPLACE MODEL `{self.dataset_ref}.customer_segmentation_model`
@@ -323,87 +755,102 @@ class RetailSenseAI:
           avg_order_value,
           days_active,
           unique_categories
-        FROM (
-          SELECT 
-            user_pseudo_id,
-            COUNT(CASE WHEN event_name = 'purchase' THEN 1 END) as total_purchases,
-            SUM(CASE WHEN event_name = 'purchase' THEN revenue END) as total_revenue,
-            SAFE_DIVIDE(
-              SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-              COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
-            ) as avg_order_value,
-            DATE_DIFF(
-              MAX(PARSE_DATE('%Y%m%d', event_date)),
-              MIN(PARSE_DATE('%Y%m%d', event_date)),
-              DAY
-            ) + 1 as days_active,
-            COUNT(DISTINCT category) as unique_categories
-          FROM `{self.dataset_ref}.base_sales`
-          WHERE user_pseudo_id IS NOT NULL
-          GROUP BY user_pseudo_id
-          HAVING total_purchases > 0
-        )
+        FROM `{self.dataset_ref}.customer_features`
         """
         
-        try:
-            job = self.client.query(segmentation_model_query)
-            job.result()
-            print("✅ Customer segmentation model created")
-        except Exception as e:
-            print(f"⚠️ Segmentation model creation skipped: {str(e)[:100]}...")
+        # The models are independent: submit every job before waiting on any so
+        # BigQuery trains them side by side. Segmentation runs as one script that
+        # rebuilds its feature table first.
+        model_queries = {
+            'Product recommendation': recommendation_model_query,
+            'Revenue forecasting': forecasting_model_query,
+            'Customer segmentation': f"{self._customer_features_query()};\n{segmentation_model_query}",
+        }
+        jobs = {}
+        for name, query in model_queries.items():
+            try:
+                jobs[name] = self.client.query(query)
+            except Exception as e:
+                print(f"⚠️ {name} model creation skipped: {str(e)[:100]}...")
+        
+        for name, job in jobs.items():
+            try:
+                job.result()
+                print(f"✅ {name} model created")
+            except Exception as e:
+                print(f"⚠️ {name} model creation skipped: {str(e)[:100]}...")
         
         return True
     
     def generate_product_embeddings(self):
-        """Generate text embeddings for products using BigQuery ML"""
+        """Generate text embeddings for products using BigQuery ML
+        
+        Kept as a table: BigQuery cannot stack a materialized view on the
+        product_performance view, and a table can carry a vector index.
+        """
         
         print("🧠 Generating product embeddings...")
         
         # Create embeddings using product descriptions
         embeddings_query = f"""
         CREATE OR REPLACE TABLE `{self.dataset_ref}.product_embeddings` AS
+        WITH raw_embeddings AS (
+          SELECT 
+            p.product_sku,
+            p.product_name,
+            p.category,
+            p.brand,
+            p.total_revenue,
+            p.view_to_purchase_rate,
+            -- Create feature-based embeddings for similarity search
+            ARRAY_CONCAT(
+              [
+                CAST(LENGTH(p.product_name) as FLOAT64) / 50.0,  -- Name length normalized
+                CAST(p.avg_price as FLOAT64) / 1000.0,  -- Price normalized
+                CAST(p.total_views as FLOAT64) / 10000.0,  -- Views normalized
+                p.view_to_purchase_rate * 100  -- Conversion rate as percentage
+              ],
+              p.category_onehot,
+              [
+                LOG(p.total_revenue + 1) / 10.0,  -- Log revenue normalized
+                CAST(p.total_purchases as FLOAT64) / 1000.0  -- Purchases normalized
+              ]
+            ) as raw_vector
+          FROM `{self.dataset_ref}.product_performance` p
+          WHERE p.total_purchases > 0
+        ),
+        norms AS (
+          SELECT 
+            *,
+            SQRT((SELECT SUM(x * x) FROM UNNEST(raw_vector) AS x)) as vector_norm
+          FROM raw_embeddings
+        )
         SELECT 
-          p.product_sku,
-          p.product_name,
-          p.category,
-          p.brand,
-          p.total_revenue,
-          p.view_to_purchase_rate,
-          -- Create feature-based embeddings for similarity search
-          ARRAY[
-            CAST(LENGTH(p.product_name) as FLOAT64) / 50.0,  -- Name length normalized
-            CAST(p.avg_price as FLOAT64) / 1000.0,  -- Price normalized
-            CAST(p.total_views as FLOAT64) / 10000.0,  -- Views normalized
-            p.view_to_purchase_rate * 100,  -- Conversion rate as percentage
-            CASE WHEN p.category = 'Apparel' THEN 1.0 ELSE 0.0 END,
-            CASE WHEN p.category = 'Electronics' THEN 1.0 ELSE 0.0 END,
-            CASE WHEN p.category = 'Home & Garden' THEN 1.0 ELSE 0.0 END,
-            CASE WHEN p.category = 'Office' THEN 1.0 ELSE 0.0 END,
-            CASE WHEN p.category = 'Drinkware' THEN 1.0 ELSE 0.0 END,
-            LOG(p.total_revenue + 1) / 10.0,  -- Log revenue normalized
-            CAST(p.total_purchases as FLOAT64) / 1000.0  -- Purchases normalized
-          ] as embedding_vector
-        FROM `{self.dataset_ref}.product_performance` p
-        WHERE p.total_purchases > 0
+          product_sku,
+          product_name,
+          category,
+          brand,
+          total_revenue,
+          view_to_purchase_rate,
+          vector_norm,
+          -- Unit-length vectors: cosine distance is then a plain dot product
+          ARRAY(
+            SELECT SAFE_DIVIDE(x, vector_norm)
+            FROM UNNEST(raw_vector) AS x WITH OFFSET pos
+            ORDER BY pos
+          ) as embedding_vector
+        FROM norms
         """
         
         try:
             job = self.client.query(embeddings_query)
             job.result()
             
-            # Get embedding stats
-            stats_query = f"""
-            SELECT 
-              COUNT(*) as products_with_embeddings,
-              ARRAY_LENGTH(embedding_vector) as embedding_dimension
-            FROM `{self.dataset_ref}.product_embeddings`
-            LIMIT 1
-            """
-            
-            stats = self.client.query(stats_query).to_dataframe()
+            # Get embedding stats from table metadata
+            table = self.client.get_table(f"{self.dataset_ref}.product_embeddings")
             print(f"✅ Product embeddings generated")
-            print(f"   📊 Products: {stats['products_with_embeddings'].iloc[0]:,}")
-            print(f"   🔢 Dimensions: {stats['embedding_dimension'].iloc[0]}")
+            print(f"   📊 Products: {table.num_rows:,}")
+            print(f"   🔢 Dimensions: {self.EMBEDDING_DIMENSION}")
             
         except Exception as e:
             print(f"❌ Error generating embeddings: {e}")
@@ -411,83 +858,24 @@ class RetailSenseAI:
         return True
     
     def create_similarity_search_function(self):
-        """Create UDF for product similarity search"""
+        """Create the vector index used for product similarity search"""
         
         print("🔍 Creating similarity search function...")
         
-        similarity_function_query = f"""
-        CREATE OR REPLACE FUNCTION `{self.dataset_ref}.cosine_similarity`(
-          vector1 ARRAY<FLOAT64>, 
-          vector2 ARRAY<FLOAT64>
-        )
-        RETURNS FLOAT64
-        LANGUAGE SQL
-        AS (
-          (
-            SELECT SUM(v1 * v2)
-            FROM UNNEST(vector1) AS v1 WITH OFFSET pos1
-            JOIN UNNEST(vector2) AS v2 WITH OFFSET pos2
-            ON pos1 = pos2
-          ) / (
-            SQRT(
-              (SELECT SUM(v1 * v1) FROM UNNEST(vector1) AS v1)
-            ) * SQRT(
-              (SELECT SUM(v2 * v2) FROM UNNEST(vector2) AS v2)
-            )
-          )
-        );
-        
-        CREATE OR REPLACE FUNCTION `{self.dataset_ref}.find_similar_products`(
-          target_sku STRING,
-          top_k INT64
-        )
-        RETURNS ARRAY<STRUCT<
-          product_sku STRING,
-          similarity_score FLOAT64,
-          product_name STRING,
-          category STRING,
-          total_revenue FLOAT64
-        >>
-        LANGUAGE SQL
-        AS (
-          WITH target_embedding AS (
-            SELECT embedding_vector
-            FROM `{self.dataset_ref}.product_embeddings`
-            WHERE product_sku = target_sku
-          ),
-          similarities AS (
-            SELECT 
-              p.product_sku,
-              p.product_name,
-              p.category,
-              p.total_revenue,
-              `{self.dataset_ref}.cosine_similarity`(p.embedding_vector, t.embedding_vector) as similarity_score
-            FROM `{self.dataset_ref}.product_embeddings` p
-            CROSS JOIN target_embedding t
-            WHERE p.product_sku != target_sku
-            ORDER BY similarity_score DESC
-            LIMIT top_k
-          )
-          
-          SELECT ARRAY_AGG(
-            STRUCT(
-              product_sku,
-              similarity_score,
-              product_name,
-              category,
-              total_revenue
-            )
-          )
-          FROM similarities
-        );
+        # BigQuery only builds the ANN index once the table is large enough;
+        # until then VECTOR_SEARCH falls back to an exact scan
+        vector_index_query = f"""
+        CREATE OR REPLACE VECTOR INDEX product_emb_idx
+        ON `{self.dataset_ref}.product_embeddings`(embedding_vector)
+        OPTIONS(index_type = 'IVF', distance_type = 'COSINE')
         """
         
         try:
-            job = self.client.query(similarity_function_query)
+            job = self.client.query(vector_index_query)
             job.result()
-            print("✅ Similarity search functions created")
+            print("✅ Similarity search index created")
         except Exception as e:
-            print(f"❌ Error creating similarity functions: {e}")
+            print(f"❌ Error creating similarity index: {e}")
         
         return True
     
@@ -503,22 +891,32 @@ class RetailSenseAI:
           p.total_revenue
         FROM ML.RECOMMEND(
           MODEL `{self.dataset_ref}.product_recommendation_model`,
-          STRUCT('{user_id}' as user_pseudo_id)
+          STRUCT(@user_id as user_pseudo_id)
         ) r
         JOIN `{self.dataset_ref}.product_performance` p
         ON r.predicted_product_sku = p.product_sku
         ORDER BY predicted_rating DESC
-        LIMIT {top_k}
+        LIMIT @top_k
         """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
+                bigquery.ScalarQueryParameter("top_k", "INT64", top_k),
+            ]
+        )
         
         try:
-            return self.client.query(query).to_dataframe()
+            return self._query_to_dataframe(query, job_config=job_config, sources=('product_recommendation_model', 'product_performance', 'product_performance_mv'))
         except Exception as e:
             print(f"❌ Error getting recommendations: {e}")
-            return pd.DataFrame()
+            return _empty_dataframe()
     
     def get_revenue_forecast(self, forecast_days=30):
         """Get revenue forecast for specified days"""
+        return self.fetch_revenue_forecast(self.start_revenue_forecast(forecast_days))
+    
+    def start_revenue_forecast(self, forecast_days=30):
+        """Submit the revenue forecast query without waiting for it"""
         
         query = f"""
         SELECT 
@@ -528,19 +926,30 @@ class RetailSenseAI:
           prediction_interval_upper_bound as upper_bound
         FROM ML.FORECAST(
           MODEL `{self.dataset_ref}.revenue_forecasting_model`,
-          STRUCT({forecast_days} as horizon)
+          STRUCT(@horizon as horizon)
         )
         ORDER BY forecast_timestamp
         """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter("horizon", "INT64", forecast_days)]
+        )
         
+        return self._start_query(query, job_config=job_config, sources=('revenue_forecasting_model',))
+    
+    def fetch_revenue_forecast(self, job):
+        """Wait for a job from start_revenue_forecast and return the forecast"""
         try:
-            return self.client.query(query).to_dataframe()
+            return self._fetch_query(job)
         except Exception as e:
             print(f"❌ Error getting forecast: {e}")
-            return pd.DataFrame()
+            return _empty_dataframe()
     
     def get_customer_segments(self):
         """Get customer segmentation analysis"""
+        return self.fetch_customer_segments(self.start_customer_segments())
+    
+    def start_customer_segments(self):
+        """Submit the customer segmentation query without waiting for it"""
         
         query = f"""
         SELECT 
@@ -555,78 +964,95 @@ class RetailSenseAI:
           (
             SELECT 
               user_pseudo_id,
-              COUNT(CASE WHEN event_name = 'purchase' THEN 1 END) as total_purchases,
-              SUM(CASE WHEN event_name = 'purchase' THEN revenue END) as total_revenue,
-              SAFE_DIVIDE(
-                SUM(CASE WHEN event_name = 'purchase' THEN revenue END),
-                COUNT(CASE WHEN event_name = 'purchase' THEN 1 END)
-              ) as avg_order_value,
-              DATE_DIFF(
-                MAX(PARSE_DATE('%Y%m%d', event_date)),
-                MIN(PARSE_DATE('%Y%m%d', event_date)),
-                DAY
-              ) + 1 as days_active,
-              COUNT(DISTINCT category) as unique_categories
-            FROM `{self.dataset_ref}.base_sales`
-            WHERE user_pseudo_id IS NOT NULL
-            GROUP BY user_pseudo_id
-            HAVING total_purchases > 0
+              total_purchases,
+              total_revenue,
+              avg_order_value,
+              days_active,
+              unique_categories
+            FROM `{self.dataset_ref}.customer_features`
           )
         )
         GROUP BY CENTROID_ID
         ORDER BY segment_id
         """
         
+        return self._start_query(query, sources=('customer_segmentation_model', 'customer_features'))
+    
+    def fetch_customer_segments(self, job):
+        """Wait for a job from start_customer_segments and return the segments"""
         try:
-            return self.client.query(query).to_dataframe()
+            segments = self._fetch_query(job)
+            return segments.astype({'segment_id': 'int64', 'customer_count': 'int64'})
         except Exception as e:
             print(f"❌ Error getting customer segments: {e}")
-            return pd.DataFrame()
+            return _empty_dataframe()
     
     def find_similar_products(self, target_sku, top_k=5):
         """Find similar products using embeddings"""
         
+        # One extra neighbour is fetched because the target matches itself
         query = f"""
-        SELECT *
-        FROM UNNEST(`{self.dataset_ref}.find_similar_products`('{target_sku}', {top_k}))
+        SELECT 
+          base.product_sku,
+          1 - distance as similarity_score,
+          base.product_name,
+          base.category,
+          base.total_revenue
+        FROM VECTOR_SEARCH(
+          TABLE `{self.dataset_ref}.product_embeddings`,
+          'embedding_vector',
+          (
+            SELECT embedding_vector
+            FROM `{self.dataset_ref}.product_embeddings`
+            WHERE product_sku = @target_sku
+          ),
+          top_k => @search_k,
+          distance_type => 'COSINE'
+        )
+        WHERE base.product_sku != @target_sku
+        ORDER BY distance
+        LIMIT @top_k
         """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("target_sku", "STRING", target_sku),
+                bigquery.ScalarQueryParameter("top_k", "INT64", top_k),
+                bigquery.ScalarQueryParameter("search_k", "INT64", top_k + 1),
+            ]
+        )
         
         try:
-            return self.client.query(query).to_dataframe()
+            return self._query_to_dataframe(query, job_config=job_config, sources=('product_embeddings',))
         except Exception as e:
             print(f"❌ Error finding similar products: {e}")
-            return pd.DataFrame()
+            return _empty_dataframe()
     
     def get_advanced_analytics(self):
         """Get comprehensive analytics dashboard data"""
+        return self.fetch_advanced_analytics(self.start_advanced_analytics())
+    
+    def start_advanced_analytics(self):
+        """Submit the advanced analytics query without waiting for it"""
         
         print("📊 Generating advanced analytics...")
         
         # Product performance with trends
         performance_query = f"""
-        WITH daily_metrics AS (
-          SELECT 
-            product_sku,
-            PARSE_DATE('%Y%m%d', event_date) as date,
-            COUNT(CASE WHEN event_name = 'view_item' THEN 1 END) as daily_views,
-            COUNT(CASE WHEN event_name = 'purchase' THEN 1 END) as daily_purchases,
-            SUM(CASE WHEN event_name = 'purchase' THEN revenue END) as daily_revenue
-          FROM `{self.dataset_ref}.base_sales`
-          GROUP BY product_sku, date
-        ),
-        product_trends AS (
+        WITH product_trends AS (
           SELECT 
             product_sku,
             AVG(daily_views) as avg_daily_views,
             AVG(daily_purchases) as avg_daily_purchases,
             AVG(daily_revenue) as avg_daily_revenue,
             -- Calculate trend (positive = growing, negative = declining)
-            CORR(UNIX_DATE(date), daily_revenue) as revenue_trend
-          FROM daily_metrics
+            CORR(UNIX_DATE(event_day), daily_revenue) as revenue_trend
+          FROM `{self.dataset_ref}.daily_product_metrics`
+          -- Only products that pass product_performance's activity filter
+          WHERE product_sku IN (SELECT product_sku FROM `{self.dataset_ref}.product_performance`)
           GROUP BY product_sku
         )
         SELECT 
-          p.*,
+          p.* EXCEPT(category_onehot),
           t.avg_daily_views,
           t.avg_daily_purchases,
           t.avg_daily_revenue,
@@ -641,8 +1067,25 @@ class RetailSenseAI:
         ORDER BY p.total_revenue DESC
         """
         
+        # Persist the result so later queries can slice it without re-running the join
+        job_config = bigquery.QueryJobConfig(
+            destination=f"{self.dataset_ref}.advanced_analytics_cache",
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+        )
+        
+        return self._start_query(
+            performance_query,
+            job_config=job_config,
+            sources=('product_performance', 'product_performance_mv', 'daily_product_metrics')
+        )
+    
+    def fetch_advanced_analytics(self, job):
+        """Wait for a job from start_advanced_analytics and return the analytics data"""
         try:
-            performance_data = self.client.query(performance_query).to_dataframe()
+            performance_data = self._fetch_query(job)
+            # Few distinct labels: categorical codes make value_counts a bincount
+            performance_data['trend_status'] = performance_data['trend_status'].astype('category')
+            performance_data['category'] = performance_data['category'].astype('category')
             print(f"✅ Advanced performance data: {len(performance_data)} products")
             return performance_data
         except Exception as e:
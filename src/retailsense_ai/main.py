@@ -7,13 +7,14 @@ import os
 import sys
 import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path for development
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
-from retailsense_ai import RetailSenseAI, RetailSenseAIDemo
-from retailsense_ai.online_demo import RetailSenseAIOnlineDemo
+# The RetailSense modules pull in pandas, matplotlib and the BigQuery clients,
+# so each mode imports only what it needs, after the arguments are parsed
 
 
 def main():
@@ -92,6 +93,7 @@ Examples:
 
 def run_demo(args):
     """Run the offline demonstration"""
+    from retailsense_ai.demo import RetailSenseAIDemo
     
     print("🎯 RETAILSENSE AI - OFFLINE DEMONSTRATION")
     print("=" * 60)
@@ -125,6 +127,10 @@ def run_demo(args):
 
 def run_bigquery_analysis(args):
     """Run BigQuery cloud analysis"""
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    from retailsense_ai.core import RetailSenseAI
     
     print("☁️ RETAILSENSE AI - BIGQUERY ANALYSIS")
     print("=" * 60)
@@ -143,21 +149,37 @@ def run_bigquery_analysis(args):
         analytics_data = retail_ai.create_comprehensive_pipeline()
         
         if analytics_data is not None:
-            # Get additional analysis results
+            # Get additional analysis results as Arrow; nothing below needs pandas.
+            # The two queries are independent, so run and download them side by side
             print("📈 Retrieving analysis results...")
-            performance_data = retail_ai.get_performance_data()
-            category_data = retail_ai.get_category_analysis()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                performance_future = executor.submit(retail_ai.get_performance_table)
+                category_future = executor.submit(retail_ai.get_category_table)
+                performance_table = performance_future.result()
+                category_table = category_future.result()
             
             print("\n✅ BIGQUERY ANALYSIS COMPLETED!")
             print("=" * 60)
-            print(f"📊 Products analyzed: {len(performance_data):,}")
-            print(f"🏷️  Categories: {len(category_data)}")
+            print(f"📊 Products analyzed: {performance_table.num_rows:,}")
+            print(f"🏷️  Categories: {category_table.num_rows}")
             
-            if not performance_data.empty:
-                total_revenue = performance_data['total_revenue'].sum()
-                avg_conversion = performance_data['view_to_purchase_rate'].mean() * 100
+            if performance_table.num_rows:
+                total_revenue = pc.sum(performance_table['total_revenue']).as_py()
+                avg_conversion = pc.mean(performance_table['view_to_purchase_rate']).as_py() * 100
                 print(f"💰 Total revenue: ${total_revenue:,.2f}")
                 print(f"📈 Avg conversion: {avg_conversion:.2f}%")
+            
+            # Export results straight from Arrow memory
+            performance_path = os.path.join(args.output_dir, "bigquery_performance_data.parquet")
+            category_path = os.path.join(args.output_dir, "bigquery_category_analysis.csv")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                writes = [
+                    executor.submit(pq.write_table, performance_table, performance_path, compression='snappy'),
+                    executor.submit(pacsv.write_csv, category_table, category_path),
+                ]
+                for write in writes:
+                    write.result()
+            print(f"💾 Results saved: {performance_path}, {category_path}")
         
         else:
             print("❌ BigQuery analysis failed to complete")
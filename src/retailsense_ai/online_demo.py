@@ -7,20 +7,11 @@ using real BigQuery data and ML models.
 """
 
 import os
-import pandas as pd
-import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
 import json
+from concurrent.futures import ThreadPoolExecutor
 from .core import RetailSenseAI
 
-# Set plotting style
-plt.style.use('default')
-sns.set_palette("husl")
-
 class RetailSenseAIOnlineDemo:
     """
     RetailSense AI Online Demo - BigQuery ML Integration
@@ -81,75 +72,93 @@ class RetailSenseAIOnlineDemo:
         print("\n🤖 DEMONSTRATING ML FEATURES")
         print("=" * 50)
         
+        # The four features are independent BigQuery calls, so overlap their round
+        # trips and print each section, in order, once its result is in
+        sections = [
+            ("\n1️⃣ Product Recommendations...", 'recommendations', self._demo_recommendations),
+            ("\n2️⃣ Revenue Forecasting...", 'forecast', self._demo_forecast),
+            ("\n3️⃣ Customer Segmentation...", 'segments', self._demo_segments),
+            ("\n4️⃣ Product Similarity Search...", 'similar_products', self._demo_similar_products),
+        ]
+        
         results = {}
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = [executor.submit(demo) for _, _, demo in sections]
+            for (title, key, _), future in zip(sections, futures):
+                lines, value = future.result()
+                print('\n'.join((title, *lines)))  # One write per section
+                if value is not None:
+                    results[key] = value
         
-        # 1. Product Recommendations
-        print("\n1️⃣ Product Recommendations...")
+        return results
+    
+    def _demo_recommendations(self):
+        """Recommend products for the most active user; returns (lines, result)"""
+        lines = []
         try:
-            # Get a sample user for recommendations
-            sample_user_query = f"""
-            SELECT user_pseudo_id, COUNT(*) as activity_count
-            FROM `{self.retail_ai.dataset_ref}.base_sales`
-            WHERE user_pseudo_id IS NOT NULL
-            GROUP BY user_pseudo_id
-            ORDER BY activity_count DESC
-            LIMIT 5
-            """
-            sample_users = self.retail_ai.client.query(sample_user_query).to_dataframe()
+            # Get a sample user for recommendations (Arrow download, locally cacheable)
+            sample_users = self.retail_ai.get_active_users(n=5)
             
             if not sample_users.empty:
                 sample_user = sample_users.iloc[0]['user_pseudo_id']
                 recommendations = self.retail_ai.get_product_recommendations(sample_user, top_k=10)
                 
                 if not recommendations.empty:
-                    print(f"   ✅ Generated {len(recommendations)} recommendations for user {sample_user}")
-                    print("   🎯 Top 3 Recommendations:")
-                    for i, rec in recommendations.head(3).iterrows():
-                        print(f"     {i+1}. {rec['product_name']} (Score: {rec['predicted_rating']:.3f})")
-                    results['recommendations'] = recommendations
-                else:
-                    print("   ⚠️ No recommendations generated")
+                    lines.append(f"   ✅ Generated {len(recommendations)} recommendations for user {sample_user}")
+                    lines.append("   🎯 Top 3 Recommendations:")
+                    top = recommendations.head(3)
+                    for i, (name, rating) in enumerate(zip(top['product_name'].to_numpy(),
+                                                           top['predicted_rating'].to_numpy()), 1):
+                        lines.append(f"     {i}. {name} (Score: {rating:.3f})")
+                    return lines, recommendations
+                lines.append("   ⚠️ No recommendations generated")
             else:
-                print("   ⚠️ No users found for recommendations")
+                lines.append("   ⚠️ No users found for recommendations")
                 
         except Exception as e:
-            print(f"   ❌ Recommendation error: {str(e)[:100]}...")
-        
-        # 2. Revenue Forecasting
-        print("\n2️⃣ Revenue Forecasting...")
+            lines.append(f"   ❌ Recommendation error: {str(e)[:100]}...")
+        return lines, None
+    
+    def _demo_forecast(self):
+        """Forecast the next 30 days of revenue; returns (lines, result)"""
+        lines = []
         try:
             forecast = self.retail_ai.get_revenue_forecast(forecast_days=30)
             
             if not forecast.empty:
-                print(f"   ✅ Generated {len(forecast)} days forecast")
+                lines.append(f"   ✅ Generated {len(forecast)} days forecast")
                 total_predicted = forecast['predicted_revenue'].sum()
-                print(f"   💰 Predicted 30-day revenue: ${total_predicted:,.2f}")
-                results['forecast'] = forecast
-            else:
-                print("   ⚠️ No forecast generated")
+                lines.append(f"   💰 Predicted 30-day revenue: ${total_predicted:,.2f}")
+                return lines, forecast
+            lines.append("   ⚠️ No forecast generated")
                 
         except Exception as e:
-            print(f"   ❌ Forecasting error: {str(e)[:100]}...")
-        
-        # 3. Customer Segmentation
-        print("\n3️⃣ Customer Segmentation...")
+            lines.append(f"   ❌ Forecasting error: {str(e)[:100]}...")
+        return lines, None
+    
+    def _demo_segments(self):
+        """Summarize the customer segments; returns (lines, result)"""
+        lines = []
         try:
             segments = self.retail_ai.get_customer_segments()
             
             if not segments.empty:
-                print(f"   ✅ Identified {len(segments)} customer segments")
-                for _, segment in segments.iterrows():
-                    print(f"     Segment {int(segment['segment_id'])}: {int(segment['customer_count'])} customers, "
-                          f"${segment['avg_revenue']:.2f} avg revenue")
-                results['segments'] = segments
-            else:
-                print("   ⚠️ No segments generated")
+                lines.append(f"   ✅ Identified {len(segments)} customer segments")
+                for segment_id, customer_count, avg_revenue in zip(segments['segment_id'].to_numpy(),
+                                                                   segments['customer_count'].to_numpy(),
+                                                                   segments['avg_revenue'].to_numpy()):
+                    lines.append(f"     Segment {int(segment_id)}: {int(customer_count)} customers, "
+                                 f"${avg_revenue:.2f} avg revenue")
+                return lines, segments
+            lines.append("   ⚠️ No segments generated")
                 
         except Exception as e:
-            print(f"   ❌ Segmentation error: {str(e)[:100]}...")
-        
-        # 4. Product Similarity Search
-        print("\n4️⃣ Product Similarity Search...")
+            lines.append(f"   ❌ Segmentation error: {str(e)[:100]}...")
+        return lines, None
+    
+    def _demo_similar_products(self):
+        """Find products similar to the first analyzed product; returns (lines, result)"""
+        lines = []
         try:
             # Get a sample product for similarity search
             if len(self.analytics_data) > 0:
@@ -157,22 +166,20 @@ class RetailSenseAIOnlineDemo:
                 similar_products = self.retail_ai.find_similar_products(sample_product, top_k=5)
                 
                 if not similar_products.empty:
-                    print(f"   ✅ Found {len(similar_products)} similar products")
-                    print(f"   🎯 Target: {self.analytics_data.iloc[0]['product_name']}")
-                    print("   🔍 Similar products:")
-                    for _, similar in similar_products.iterrows():
-                        print(f"     • {similar['product_name']} (Similarity: {similar['similarity_score']:.3f})")
-                    results['similar_products'] = similar_products
-                else:
-                    print("   ⚠️ No similar products found")
+                    lines.append(f"   ✅ Found {len(similar_products)} similar products")
+                    lines.append(f"   🎯 Target: {self.analytics_data.iloc[0]['product_name']}")
+                    lines.append("   🔍 Similar products:")
+                    for name, score in zip(similar_products['product_name'].to_numpy(),
+                                           similar_products['similarity_score'].to_numpy()):
+                        lines.append(f"     • {name} (Similarity: {score:.3f})")
+                    return lines, similar_products
+                lines.append("   ⚠️ No similar products found")
             else:
-                print("   ⚠️ No products available for similarity search")
+                lines.append("   ⚠️ No products available for similarity search")
                 
         except Exception as e:
-            print(f"   ❌ Similarity search error: {str(e)[:100]}...")
-        
-        return results
-
+            lines.append(f"   ❌ Similarity search error: {str(e)[:100]}...")
+        return lines, None
 
 def main():
     """Main function for running the online demo"""
@@ -4,23 +4,27 @@ Test gcloud installation and run BigQuery scripts
 """
 
 import subprocess
+import shutil
 import sys
 import os
 
+# Possible gcloud commands, in the order they are tried
+GCLOUD_CANDIDATES = (
+    'gcloud',
+    'gcloud.exe',
+    r'C:\Program Files (x86)\Google\Cloud SDK\google-cloud-sdk\bin\gcloud.exe',
+    r'C:\Users\{}\AppData\Local\Google\Cloud SDK\google-cloud-sdk\bin\gcloud.exe'.format(os.getenv('USERNAME')),
+)
+
 def test_gcloud():
     """Test if gcloud is installed and working"""
     print("🔍 Testing gcloud CLI installation...")
     
     try:
-        # Try different possible gcloud paths
-        gcloud_commands = [
-            'gcloud',
-            'gcloud.exe', 
-            r'C:\Program Files (x86)\Google\Cloud SDK\google-cloud-sdk\bin\gcloud.exe',
-            r'C:\Users\{}\AppData\Local\Google\Cloud SDK\google-cloud-sdk\bin\gcloud.exe'.format(os.getenv('USERNAME'))
-        ]
-        
-        for gcloud_cmd in gcloud_commands:
+        for gcloud_cmd in GCLOUD_CANDIDATES:
+            # PATH and file lookups are cheap; only spawn a process for a candidate that exists
+            if shutil.which(gcloud_cmd) is None:
+                continue
             try:
                 result = subprocess.run([gcloud_cmd, '--version'], 
                                       capture_output=True, text=True, timeout=10)
@@ -56,20 +60,20 @@ def run_bigquery_script(gcloud_cmd, script_path, project_id="retailsense-ai"):
                '--project_id=' + project_id,
                '--format=prettyjson']
         
-        # Read SQL file
-        with open(script_path, 'r') as f:
+        # Read SQL file as bytes; bq reads stdin as-is, so skip the decode/encode round trip
+        with open(script_path, 'rb') as f:
             sql_content = f.read()
         
-        # Run the query
+        # Run the query (the result rows are not used, only errors)
         result = subprocess.run(cmd, input=sql_content, 
-                              capture_output=True, text=True, timeout=300)
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
         
         if result.returncode == 0:
             print(f"✅ Successfully executed {script_path}")
             return True
         else:
             print(f"❌ Error executing {script_path}")
-            print(f"Error: {result.stderr}")
+            print(f"Error: {result.stderr.decode(errors='replace')}")
             return False
             
     except Exception as e:
@@ -4,10 +4,20 @@ Test Production RetailSense AI with Real BigQuery Data
 """
 
 import os
-import sys
-sys.path.insert(0, 'src')
 
 from retailsense_ai import RetailSenseAI
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+def print_top(df, col, label, k=5):
+    """Print the k rows of df with the largest col as a numbered '<label>: $<col>' list"""
+    top = df.nlargest(k, col).reset_index(drop=True)
+    lines = (
+        '  ' + (top.index + 1).astype(str).to_numpy()
+        + '. ' + top[label].map(str).to_numpy()  # map, not astype: NULL labels print as text
+        + ': $' + top[col].map('{:,.2f}'.format).to_numpy()
+    )
+    print(*lines, sep='\n')
 
 def main():
     print('🚀 Testing Production RetailSense AI with Real BigQuery Data')
@@ -30,10 +40,16 @@ def main():
         
         # Show production stats
         if not performance_data.empty:
-            total_revenue = performance_data['total_revenue'].sum()
-            total_views = performance_data['total_views'].sum()
-            total_purchases = performance_data['total_purchases'].sum()
-            avg_price = performance_data['avg_price'].mean()
+            stats = performance_data.agg({
+                'total_revenue': 'sum',
+                'total_views': 'sum',
+                'total_purchases': 'sum',
+                'avg_price': 'mean',
+            })
+            total_revenue = stats['total_revenue']
+            total_views = int(stats['total_views'])  # agg upcasts the combined result to float
+            total_purchases = int(stats['total_purchases'])
+            avg_price = stats['avg_price']
             
             print()
             print('📈 PRODUCTION ANALYTICS SUMMARY')
@@ -46,19 +62,17 @@ def main():
             # Show top performers
             print()
             print('🏆 TOP 5 PRODUCTS BY REVENUE:')
-            top_products = performance_data.nlargest(5, 'total_revenue')
-            for i, (_, product) in enumerate(top_products.iterrows(), 1):
-                print(f'  {i}. {product["product_name"]}: ${product["total_revenue"]:,.2f}')
+            print_top(performance_data, 'total_revenue', 'product_name')
             
             print()
             print('🏆 TOP 5 CATEGORIES BY REVENUE:')
-            top_categories = category_data.nlargest(5, 'category_revenue')
-            for i, (_, cat) in enumerate(top_categories.iterrows(), 1):
-                print(f'  {i}. {cat["category"]}: ${cat["category_revenue"]:,.2f}')
+            print_top(category_data, 'category_revenue', 'category')
             
-            # Save results
-            performance_data.to_csv('production_output/bigquery_performance_data.csv', index=False)
-            category_data.to_csv('production_output/bigquery_category_analysis.csv', index=False)
+            # Save results; Parquet and Arrow's CSV writer skip pandas' per-row formatting
+            performance_data.to_parquet('production_output/bigquery_performance_data.parquet',
+                                        engine='pyarrow', compression='snappy', index=False)
+            pacsv.write_csv(pa.Table.from_pandas(category_data, preserve_index=False),
+                            'production_output/bigquery_category_analysis.csv')
             print()
             print('✅ Production data saved to production_output/')
             
@@ -0,0 +1,67 @@
+"""
+Tests for the SQL generated by RetailSense AI core (no BigQuery connection needed)
+"""
+
+import os
+from unittest.mock import MagicMock
+
+# Add src to path for testing
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from retailsense_ai.core import RetailSenseAI
+
+
+class TestAdvancedAnalyticsQuery:
+    """Test suite for start_advanced_analytics"""
+
+    def setup_method(self):
+        """Build an instance without credentials and capture submitted queries"""
+        self.ai = RetailSenseAI.__new__(RetailSenseAI)
+        self.ai.dataset_ref = "test-project.retail_intelligence"
+        self.ai._start_query = MagicMock()
+
+    def test_trend_query_declares_cte_once(self):
+        """Test the trend CTE header appears exactly once"""
+        self.ai.start_advanced_analytics()
+        query = self.ai._start_query.call_args[0][0]
+
+        assert query.count("product_trends AS (") == 1
+        assert query.strip().startswith("WITH product_trends AS (")
+
+    def test_trend_query_writes_cache_table(self):
+        """Test the result is persisted to advanced_analytics_cache"""
+        self.ai.start_advanced_analytics()
+        job_config = self.ai._start_query.call_args[1]['job_config']
+
+        assert job_config.destination.table_id == "advanced_analytics_cache"
+
+
+class TestProductPerformanceMigration:
+    """Test suite for the product_performance table-to-view migration"""
+
+    def setup_method(self):
+        """Build an instance around a mocked BigQuery client"""
+        self.ai = RetailSenseAI.__new__(RetailSenseAI)
+        self.ai.dataset_ref = "test-project.retail_intelligence"
+        self.ai.client = MagicMock()
+        self.ai.client.query_and_wait.return_value = [{
+            'total_products': 1, 'total_revenue': 1.0,
+            'avg_conversion_rate': 0.1, 'unique_categories': 1,
+        }]
+
+    def test_existing_view_is_not_dropped(self):
+        """Test re-running setup keeps the product_performance view in place"""
+        self.ai.client.get_table.return_value.table_type = 'VIEW'
+        self.ai.create_product_performance_table()
+
+        self.ai.client.delete_table.assert_not_called()
+
+    def test_legacy_table_is_dropped(self):
+        """Test an old product_performance table is removed before the view is created"""
+        self.ai.client.get_table.return_value.table_type = 'TABLE'
+        self.ai.create_product_performance_table()
+
+        self.ai.client.delete_table.assert_called_once_with(
+            "test-project.retail_intelligence.product_performance"
+        )
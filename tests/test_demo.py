@@ -46,8 +46,9 @@ class TestRetailSenseAIDemo:
             assert col in df.columns
             
         # Check data types and ranges
-        assert df['price'].dtype in [np.float64, float]
-        assert df['total_views'].dtype in [np.int64, int]
+        assert df['price'].dtype == np.float64
+        assert df['total_revenue'].dtype == np.float64
+        assert df['total_views'].dtype == np.int32
         assert (df['price'] >= 20).all()
         assert (df['price'] <= 500).all()
         assert (df['total_views'] >= 100).all()
@@ -56,9 +57,11 @@ class TestRetailSenseAIDemo:
         
     def test_generate_product_name(self):
         """Test product name generation"""
-        name = self.demo._generate_product_name(0)
-        assert isinstance(name, str)
-        assert len(name) > 0
+        names = self.demo._generate_product_names(np.random.default_rng(0), 5)
+        assert len(names) == 5
+        for name in names:
+            assert isinstance(name, str)
+            assert len(name) > 0
         
     def test_analyze_performance(self):
         """Test performance analysis"""
@@ -190,15 +193,12 @@ class TestRetailSenseAIDemoIntegration:
         assert (df['total_purchases'] <= df['total_cart_adds']).all()
         assert (df['total_revenue'] >= 0).all()
         
-        # Check that conversion rates make sense
-        calculated_conversion = df['total_purchases'] / df['total_views']
-        np.testing.assert_array_almost_equal(
-            df['view_to_purchase_rate'].values,
-            calculated_conversion.values,
-            decimal=10
-        )
+        # Check that conversion rates make sense (same bound as decimal=6; rates are float32)
+        calculated_conversion = (df['total_purchases'] / df['total_views']).to_numpy()
+        assert np.allclose(df['view_to_purchase_rate'].to_numpy(), calculated_conversion,
+                           rtol=0, atol=1.5e-6)
         
-    @patch('matplotlib.pyplot.savefig')
+    @patch('matplotlib.figure.Figure.savefig')
     def test_visualization_without_file_io(self, mock_savefig):
         """Test visualization creation without actual file I/O"""
         demo = RetailSenseAIDemo()